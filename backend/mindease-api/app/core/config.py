@@ -52,6 +52,9 @@ class Settings(BaseSettings):
     DATABASE_URL: str = Field(..., env="DATABASE_URL") 
     DATABASE_POOL_SIZE: int = Field(..., env="DATABASE_POOL_SIZE") 
     DATABASE_MAX_OVERFLOW: int = Field(..., env="DATABASE_MAX_OVERFLOW")
+    DATABASE_POOL_RECYCLE: int = Field(default=1800, env="DATABASE_POOL_RECYCLE")
+    DATABASE_POOL_TIMEOUT: int = Field(default=5, env="DATABASE_POOL_TIMEOUT")  # seconds to wait for a pooled connection
+    DATABASE_QUERY_CACHE_SIZE: int = Field(default=1200, env="DATABASE_QUERY_CACHE_SIZE")
     
       
     # ─── Rate Limiting ───────────────────────────────────────────────────────
@@ -0,0 +1,65 @@
+"""add indexes backing feedback analytics lookups
+
+Revision ID: 013_feedback_analytics_idx
+Revises: 012_update__doc_embeddings
+Create Date: 2025-06-24
+"""
+from alembic import op
+import sqlalchemy as sa
+# ---------------------------------------------------------------------------
+revision      = "013_feedback_analytics_idx"
+down_revision = "012_update__doc_embeddings"
+branch_labels = None
+depends_on    = None
+# ---------------------------------------------------------------------------
+
+
+def _column_exists(table: str, col: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return col in [c["name"] for c in insp.get_columns(table)]
+
+
+def _index_exists(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return name in [i["name"] for i in insp.get_indexes(table)]
+
+
+# ────────────────────────── upgrade ────────────────────────────────────────
+def upgrade():
+    # daily/weekly/monthly existence probes filter on (period_type, period_start)
+    if (
+        _column_exists("feedback_analytics", "period_type")
+        and _column_exists("feedback_analytics", "period_start")
+        and not _index_exists("feedback_analytics", "ix_fa_type_start")
+    ):
+        op.create_index(
+            "ix_fa_type_start",
+            "feedback_analytics",
+            ["period_type", "period_start"],
+        )
+
+    # trends GROUP BY date(created_at)
+    if not _index_exists("rag_feedback", "ix_rf_created_day"):
+        op.execute(
+            "CREATE INDEX ix_rf_created_day ON rag_feedback ((date(created_at)))"
+        )
+
+    # organization filters join through users.id, then range on created_at
+    if not _index_exists("rag_feedback", "ix_rf_user_created"):
+        op.create_index(
+            "ix_rf_user_created",
+            "rag_feedback",
+            ["user_id", "created_at"],
+        )
+
+
+# ───────────────────────── downgrade ───────────────────────────────────────
+def downgrade():
+    if _index_exists("rag_feedback", "ix_rf_user_created"):
+        op.drop_index("ix_rf_user_created", table_name="rag_feedback")
+    if _index_exists("rag_feedback", "ix_rf_created_day"):
+        op.drop_index("ix_rf_created_day", table_name="rag_feedback")
+    if _index_exists("feedback_analytics", "ix_fa_type_start"):
+        op.drop_index("ix_fa_type_start", table_name="feedback_analytics")
@@ -0,0 +1,78 @@
+"""make feedback_analytics (period_type, period_start) unique
+
+Revision ID: 014_fa_unique_period
+Revises: 013_feedback_analytics_idx
+Create Date: 2025-06-25
+"""
+from alembic import op
+import sqlalchemy as sa
+# ---------------------------------------------------------------------------
+revision      = "014_fa_unique_period"
+down_revision = "013_feedback_analytics_idx"
+branch_labels = None
+depends_on    = None
+# ---------------------------------------------------------------------------
+
+
+def _column_exists(table: str, col: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return col in [c["name"] for c in insp.get_columns(table)]
+
+
+def _index_exists(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return name in [i["name"] for i in insp.get_indexes(table)]
+
+
+def _constraint_exists(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return name in [c["name"] for c in insp.get_unique_constraints(table)]
+
+
+# ────────────────────────── upgrade ────────────────────────────────────────
+def upgrade():
+    if not (
+        _column_exists("feedback_analytics", "period_type")
+        and _column_exists("feedback_analytics", "period_start")
+    ):
+        return
+
+    # racing backfills may already have written duplicate buckets
+    op.execute(
+        """
+        DELETE FROM feedback_analytics a
+        USING feedback_analytics b
+        WHERE a.period_type = b.period_type
+          AND a.period_start = b.period_start
+          AND a.ctid > b.ctid
+        """
+    )
+
+    if not _constraint_exists("feedback_analytics", "uq_fa_type_start"):
+        op.create_unique_constraint(
+            "uq_fa_type_start",
+            "feedback_analytics",
+            ["period_type", "period_start"],
+        )
+
+    # the unique constraint's index covers the same lookups
+    if _index_exists("feedback_analytics", "ix_fa_type_start"):
+        op.drop_index("ix_fa_type_start", table_name="feedback_analytics")
+
+
+# ───────────────────────── downgrade ───────────────────────────────────────
+def downgrade():
+    if not _column_exists("feedback_analytics", "period_type"):
+        return
+
+    if not _index_exists("feedback_analytics", "ix_fa_type_start"):
+        op.create_index(
+            "ix_fa_type_start",
+            "feedback_analytics",
+            ["period_type", "period_start"],
+        )
+    if _constraint_exists("feedback_analytics", "uq_fa_type_start"):
+        op.drop_constraint("uq_fa_type_start", "feedback_analytics", type_="unique")
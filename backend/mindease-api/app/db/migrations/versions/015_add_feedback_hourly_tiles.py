@@ -0,0 +1,70 @@
+"""add feedback_hourly_tiles rollup table
+
+Revision ID: 015_feedback_hourly_tiles
+Revises: 014_fa_unique_period
+Create Date: 2025-06-26
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+# ---------------------------------------------------------------------------
+revision      = "015_feedback_hourly_tiles"
+down_revision = "014_fa_unique_period"
+branch_labels = None
+depends_on    = None
+# ---------------------------------------------------------------------------
+
+
+def _table_exists(table: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return table in insp.get_table_names()
+
+
+# ────────────────────────── upgrade ────────────────────────────────────────
+def upgrade():
+    if _table_exists("feedback_hourly_tiles"):
+        return
+
+    op.create_table(
+        "feedback_hourly_tiles",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("organization_id", sa.Integer(), nullable=True),
+        sa.Column("feedback_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rating_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rating_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("rating_sqsum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+        sa.UniqueConstraint(
+            "hour", "organization_id",
+            name="uq_fht_hour_org",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    # seed tiles from the feedback recorded so far
+    op.execute(
+        """
+        INSERT INTO feedback_hourly_tiles
+            (id, hour, organization_id, feedback_count, rating_count, rating_sum, rating_sqsum)
+        SELECT gen_random_uuid(),
+               date_trunc('hour', f.created_at),
+               u.organization_id,
+               count(*),
+               count(f.overall_rating),
+               coalesce(sum(f.overall_rating), 0),
+               coalesce(sum(f.overall_rating * f.overall_rating), 0)
+        FROM rag_feedback f
+        JOIN users u ON u.id = f.user_id
+        GROUP BY 2, 3
+        """
+    )
+
+
+# ───────────────────────── downgrade ───────────────────────────────────────
+def downgrade():
+    if _table_exists("feedback_hourly_tiles"):
+        op.drop_table("feedback_hourly_tiles")
@@ -0,0 +1,63 @@
+"""add indexes backing the learning readiness and performance scans
+
+Revision ID: 016_feedback_hot_path_idx
+Revises: 015_feedback_hourly_tiles
+Create Date: 2025-06-27
+"""
+from alembic import op
+import sqlalchemy as sa
+# ---------------------------------------------------------------------------
+revision      = "016_feedback_hot_path_idx"
+down_revision = "015_feedback_hourly_tiles"
+branch_labels = None
+depends_on    = None
+# ---------------------------------------------------------------------------
+
+
+def _index_exists(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return name in [i["name"] for i in insp.get_indexes(table)]
+
+
+# ────────────────────────── upgrade ────────────────────────────────────────
+def upgrade():
+    # built concurrently so the feedback table stays writable during the build
+    with op.get_context().autocommit_block():
+        # recent-window aggregates range on created_at, join users via user_id
+        # and only read rating / safety, so they can be answered from the index
+        if not _index_exists("rag_feedback", "idx_feedback_created_org"):
+            op.create_index(
+                "idx_feedback_created_org",
+                "rag_feedback",
+                [sa.text("created_at DESC"), "user_id"],
+                postgresql_include=["overall_rating", "is_safe"],
+                postgresql_concurrently=True,
+            )
+
+        # training data and performance scans only look at rated feedback
+        if not _index_exists("rag_feedback", "idx_feedback_rated"):
+            op.create_index(
+                "idx_feedback_rated",
+                "rag_feedback",
+                ["created_at"],
+                postgresql_where=sa.text("overall_rating IS NOT NULL"),
+                postgresql_concurrently=True,
+            )
+
+
+# ───────────────────────── downgrade ───────────────────────────────────────
+def downgrade():
+    with op.get_context().autocommit_block():
+        if _index_exists("rag_feedback", "idx_feedback_rated"):
+            op.drop_index(
+                "idx_feedback_rated",
+                table_name="rag_feedback",
+                postgresql_concurrently=True,
+            )
+        if _index_exists("rag_feedback", "idx_feedback_created_org"):
+            op.drop_index(
+                "idx_feedback_created_org",
+                table_name="rag_feedback",
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,61 @@
+"""make social_likes (user_id, post_id, comment_id) unique
+
+Revision ID: 017_social_like_unique
+Revises: 016_feedback_hot_path_idx
+Create Date: 2025-06-28
+"""
+from alembic import op
+import sqlalchemy as sa
+# ---------------------------------------------------------------------------
+revision      = "017_social_like_unique"
+down_revision = "016_feedback_hot_path_idx"
+branch_labels = None
+depends_on    = None
+# ---------------------------------------------------------------------------
+
+
+def _table_exists(table: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return table in insp.get_table_names()
+
+
+def _constraint_exists(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return name in [c["name"] for c in insp.get_unique_constraints(table)]
+
+
+# ────────────────────────── upgrade ────────────────────────────────────────
+def upgrade():
+    # social_likes is created from the models on fresh databases
+    if not _table_exists("social_likes"):
+        return
+
+    # racing like requests may already have written duplicate rows
+    op.execute(
+        """
+        DELETE FROM social_likes a
+        USING social_likes b
+        WHERE a.user_id = b.user_id
+          AND a.post_id IS NOT DISTINCT FROM b.post_id
+          AND a.comment_id IS NOT DISTINCT FROM b.comment_id
+          AND a.id > b.id
+        """
+    )
+
+    # NULLS NOT DISTINCT (PostgreSQL 15+) so post likes, whose comment_id is
+    # NULL, are deduplicated too; the constraint's index serves the lookups
+    if not _constraint_exists("social_likes", "uq_like_user_target"):
+        op.create_unique_constraint(
+            "uq_like_user_target",
+            "social_likes",
+            ["user_id", "post_id", "comment_id"],
+            postgresql_nulls_not_distinct=True,
+        )
+
+
+# ───────────────────────── downgrade ───────────────────────────────────────
+def downgrade():
+    if _table_exists("social_likes") and _constraint_exists("social_likes", "uq_like_user_target"):
+        op.drop_constraint("uq_like_user_target", "social_likes", type_="unique")
@@ -0,0 +1,57 @@
+"""index social_post_tags on tag_id for trending-tag counts
+
+Revision ID: 018_social_post_tag_idx
+Revises: 017_social_like_unique
+Create Date: 2025-06-28
+"""
+from alembic import op
+import sqlalchemy as sa
+# ---------------------------------------------------------------------------
+revision      = "018_social_post_tag_idx"
+down_revision = "017_social_like_unique"
+branch_labels = None
+depends_on    = None
+# ---------------------------------------------------------------------------
+
+
+def _table_exists(table: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return table in insp.get_table_names()
+
+
+def _index_exists(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return name in [i["name"] for i in insp.get_indexes(table)]
+
+
+# ────────────────────────── upgrade ────────────────────────────────────────
+def upgrade():
+    # social_post_tags is created from the models on fresh databases
+    if not _table_exists("social_post_tags"):
+        return
+
+    # built concurrently so posts can still be tagged during the build
+    with op.get_context().autocommit_block():
+        if not _index_exists("social_post_tags", "ix_spt_tag_id"):
+            op.create_index(
+                "ix_spt_tag_id",
+                "social_post_tags",
+                ["tag_id"],
+                postgresql_concurrently=True,
+            )
+
+
+# ───────────────────────── downgrade ───────────────────────────────────────
+def downgrade():
+    if not _table_exists("social_post_tags"):
+        return
+
+    with op.get_context().autocommit_block():
+        if _index_exists("social_post_tags", "ix_spt_tag_id"):
+            op.drop_index(
+                "ix_spt_tag_id",
+                table_name="social_post_tags",
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,67 @@
+"""index the per-user and per-post timelines of therapy and social tables
+
+Revision ID: 019_user_timeline_idx
+Revises: 018_social_post_tag_idx
+Create Date: 2025-06-28
+"""
+from alembic import op
+import sqlalchemy as sa
+# ---------------------------------------------------------------------------
+revision      = "019_user_timeline_idx"
+down_revision = "018_social_post_tag_idx"
+branch_labels = None
+depends_on    = None
+# ---------------------------------------------------------------------------
+
+# (name, table, leading column, created_at ordering)
+_INDEXES = (
+    ("ix_session_user_created", "therapy_sessions", "user_id", "created_at DESC"),
+    ("ix_program_user_created", "therapy_programs", "user_id", "created_at DESC"),
+    ("ix_post_user_created", "social_posts", "user_id", "created_at DESC"),
+    ("ix_comment_post_created", "social_comments", "post_id", "created_at"),
+)
+
+
+def _columns(table: str) -> set:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    if table not in insp.get_table_names():
+        return set()
+    return {c["name"] for c in insp.get_columns(table)}
+
+
+def _index_exists(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return name in [i["name"] for i in insp.get_indexes(table)]
+
+
+# ────────────────────────── upgrade ────────────────────────────────────────
+def upgrade():
+    # list endpoints filter on the leading column and page by created_at, so
+    # an ordered index scan replaces the sort; built concurrently so the
+    # tables stay writable
+    with op.get_context().autocommit_block():
+        for name, table, column, ordering in _INDEXES:
+            # tables created from the models on fresh databases may be absent
+            if not {column, "created_at"} <= _columns(table):
+                continue
+            if not _index_exists(table, name):
+                op.create_index(
+                    name,
+                    table,
+                    [column, sa.text(ordering)],
+                    postgresql_concurrently=True,
+                )
+
+
+# ───────────────────────── downgrade ───────────────────────────────────────
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _column, _ordering in reversed(_INDEXES):
+            if _columns(table) and _index_exists(table, name):
+                op.drop_index(
+                    name,
+                    table_name=table,
+                    postgresql_concurrently=True,
+                )
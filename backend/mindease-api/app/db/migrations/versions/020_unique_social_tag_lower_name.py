@@ -0,0 +1,89 @@
+"""make social_tags names unique regardless of case
+
+Revision ID: 020_social_tag_lower_name
+Revises: 019_user_timeline_idx
+Create Date: 2025-06-28
+"""
+from alembic import op
+import sqlalchemy as sa
+# ---------------------------------------------------------------------------
+revision      = "020_social_tag_lower_name"
+down_revision = "019_user_timeline_idx"
+branch_labels = None
+depends_on    = None
+# ---------------------------------------------------------------------------
+
+
+def _table_exists(table: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return table in insp.get_table_names()
+
+
+def _index_exists(table: str, name: str) -> bool:
+    bind = op.get_bind()
+    insp = sa.inspect(bind)
+    return name in [i["name"] for i in insp.get_indexes(table)]
+
+
+# ────────────────────────── upgrade ────────────────────────────────────────
+def upgrade():
+    # social_tags is created from the models on fresh databases
+    if not _table_exists("social_tags"):
+        return
+
+    # fold case/whitespace variants into the oldest tag before enforcing
+    op.execute(
+        """
+        UPDATE social_post_tags pt
+        SET tag_id = keep.id
+        FROM social_tags dup
+        JOIN social_tags keep
+          ON lower(trim(keep.name)) = lower(trim(dup.name)) AND keep.id < dup.id
+        WHERE pt.tag_id = dup.id
+          AND NOT EXISTS (
+              SELECT 1 FROM social_tags older
+              WHERE lower(trim(older.name)) = lower(trim(dup.name)) AND older.id < keep.id
+          )
+        """
+    )
+    # a post tagged with two variants now links the kept tag twice
+    op.execute(
+        """
+        DELETE FROM social_post_tags a
+        USING social_post_tags b
+        WHERE a.post_id = b.post_id
+          AND a.tag_id = b.tag_id
+          AND a.id > b.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM social_tags a
+        USING social_tags b
+        WHERE lower(trim(a.name)) = lower(trim(b.name))
+          AND a.id > b.id
+        """
+    )
+    # store the normalized form the service looks tags up by
+    op.execute(
+        """
+        UPDATE social_tags
+        SET name = lower(trim(name))
+        WHERE name <> lower(trim(name))
+        """
+    )
+
+    if not _index_exists("social_tags", "uq_social_tags_lower_name"):
+        op.create_index(
+            "uq_social_tags_lower_name",
+            "social_tags",
+            [sa.text("lower(name)")],
+            unique=True,
+        )
+
+
+# ───────────────────────── downgrade ───────────────────────────────────────
+def downgrade():
+    if _table_exists("social_tags") and _index_exists("social_tags", "uq_social_tags_lower_name"):
+        op.drop_index("uq_social_tags_lower_name", table_name="social_tags")
@@ -16,7 +16,7 @@ from app.db.models.social import (
 from app.db.models.organization import Organization, OrganizationMember, ApiKey, Subscription, Plan
 from app.db.models.conversation import Conversation, Message, ChatAnalytics, ChatFeedback, ChatSettings
 from app.db.models.rag_feedback import (
-    RAGFeedback, FeedbackAnalytics, FeedbackTrainingData, ResponseImprovement
+    RAGFeedback, FeedbackAnalytics, FeedbackHourlyTile, FeedbackTrainingData, ResponseImprovement
 )
 
 # Export all models
@@ -31,5 +31,5 @@ __all__ = [
     "SocialPost", "SocialComment", "SocialLike", "SocialTag", "SocialPostTag",
     "Organization", "OrganizationMember", "ApiKey", "Plan", "Subscription",
     "Conversation", "Message", "ChatAnalytics", "ChatFeedback", "ChatSettings",
-    "RAGFeedback", "FeedbackAnalytics", "FeedbackTrainingData", "ResponseImprovement"
+    "RAGFeedback", "FeedbackAnalytics", "FeedbackHourlyTile", "FeedbackTrainingData", "ResponseImprovement"
 ]
@@ -1,13 +1,19 @@
 """
 Base models module that defines common imports and base classes
 """
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, Float, func
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, Float, JSON, Uuid, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 
 Base = declarative_base()
 
+# JSONB on PostgreSQL, plain JSON on the SQLite test database
+PortableJSONB = JSONB().with_variant(JSON(), "sqlite")
+
+# Native UUID on PostgreSQL, CHAR(32) on the SQLite test database
+PortableUUID = UUID(as_uuid=True).with_variant(Uuid(), "sqlite")
+
 class TimestampMixin:
     """Mixin that adds created_at and updated_at columns to models"""
     created_at = Column(DateTime, default=func.now(), nullable=False)
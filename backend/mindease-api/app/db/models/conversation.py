@@ -3,11 +3,10 @@ Conversation models for persistent chat storage.
 """
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Float, JSON
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
 
-from app.db.models.base import Base
+from app.db.models.base import Base, PortableUUID
 
 
 class Conversation(Base):
@@ -39,7 +38,7 @@ class Message(Base):
     
     __tablename__ = "conversation_messages"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
     conversation_id = Column(String, ForeignKey("conversations.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     role = Column(String(20), nullable=False)  # 'user' or 'assistant'
@@ -4,13 +4,12 @@ RAG Feedback Models for MindEase
 Database models to store and analyze user feedback on RAG-generated responses
 for continuous learning and improvement.
 """
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, Boolean, ForeignKey, JSON, Index, UniqueConstraint, func, text
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime
 
-from app.db.models.base import Base, TimestampMixin
+from app.db.models.base import Base, PortableUUID, TimestampMixin
 
 
 class RAGFeedback(Base, TimestampMixin):
@@ -21,14 +20,22 @@ class RAGFeedback(Base, TimestampMixin):
     relevance, and helpfulness of RAG system responses.
     """
     __tablename__ = "rag_feedback"
+    __table_args__ = (
+        Index("ix_rf_user_created", "user_id", "created_at"),
+        Index(
+            "idx_feedback_rated",
+            "created_at",
+            postgresql_where=text("overall_rating IS NOT NULL")
+        ),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
     
     # User and conversation context
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    conversation_id = Column(UUID(as_uuid=True),
+    user_id = Column(PortableUUID, ForeignKey("users.id"), nullable=False)
+    conversation_id = Column(PortableUUID,
     ForeignKey("conversations.id"), nullable=False)
-    message_id = Column(UUID(as_uuid=True),
+    message_id = Column(PortableUUID,
     ForeignKey("conversation_messages.id"), nullable=True)
     
     # Query and response data
@@ -79,6 +86,18 @@ class RAGFeedback(Base, TimestampMixin):
         return f"<RAGFeedback(id={self.id}, user_id={self.user_id}, overall_rating={self.overall_rating})>"
 
 
+# Expression index for per-day grouping of feedback
+Index("ix_rf_created_day", func.date(RAGFeedback.created_at))
+
+# Covering index for recent-window rating / safety aggregates
+Index(
+    "idx_feedback_created_org",
+    RAGFeedback.created_at.desc(),
+    RAGFeedback.user_id,
+    postgresql_include=["overall_rating", "is_safe"]
+)
+
+
 class FeedbackAnalytics(Base, TimestampMixin):
     """
     Aggregated analytics from RAG feedback for performance monitoring.
@@ -87,8 +106,11 @@ class FeedbackAnalytics(Base, TimestampMixin):
     to track RAG system performance over time.
     """
     __tablename__ = "feedback_analytics"
+    __table_args__ = (
+        UniqueConstraint("period_type", "period_start", name="uq_fa_type_start"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
     
     # Time period for analytics
     period_start = Column(DateTime, nullable=False)
@@ -124,6 +146,39 @@ class FeedbackAnalytics(Base, TimestampMixin):
         return f"<FeedbackAnalytics(period={self.period_type}, avg_rating={self.avg_overall_rating})>"
 
 
+class FeedbackHourlyTile(Base, TimestampMixin):
+    """
+    Hourly sufficient statistics over RAG feedback.
+    
+    Each row holds counts and rating sums for one hour and organization, so
+    daily, weekly and monthly analytics can be rolled up by summing tiles
+    instead of rescanning raw feedback. Tiles only ever grow: feedback removed
+    later (e.g. through the user-delete cascade) is not subtracted.
+    """
+    __tablename__ = "feedback_hourly_tiles"
+    __table_args__ = (
+        UniqueConstraint(
+            "hour", "organization_id",
+            name="uq_fht_hour_org",
+            postgresql_nulls_not_distinct=True
+        ),
+    )
+    
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
+    
+    hour = Column(DateTime, nullable=False)  # Start of the hour (UTC)
+    organization_id = Column(Integer, ForeignKey("organizations.id", ondelete="CASCADE"), nullable=True)
+    
+    # Sufficient statistics
+    feedback_count = Column(Integer, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)  # Feedback with an overall rating
+    rating_sum = Column(Float, nullable=False, default=0.0)
+    rating_sqsum = Column(Float, nullable=False, default=0.0)
+    
+    def __repr__(self):
+        return f"<FeedbackHourlyTile(hour={self.hour}, organization_id={self.organization_id}, count={self.feedback_count})>"
+
+
 class FeedbackTrainingData(Base, TimestampMixin):
     """
     Processed feedback data for training and fine-tuning models.
@@ -133,10 +188,10 @@ class FeedbackTrainingData(Base, TimestampMixin):
     """
     __tablename__ = "feedback_training_data"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
     
     # Source feedback
-    feedback_id = Column(UUID(as_uuid=True), ForeignKey("rag_feedback.id"), nullable=False)
+    feedback_id = Column(PortableUUID, ForeignKey("rag_feedback.id"), nullable=False)
     
     # Training features
     query_embedding = Column(JSON, nullable=True)  # Serialized embedding vector
@@ -175,17 +230,17 @@ class ResponseImprovement(Base, TimestampMixin):
     """
     __tablename__ = "response_improvements"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(PortableUUID, primary_key=True, default=uuid.uuid4)
     
     # Original feedback that triggered improvement
-    feedback_id = Column(UUID(as_uuid=True), ForeignKey("rag_feedback.id"), nullable=False)
+    feedback_id = Column(PortableUUID, ForeignKey("rag_feedback.id"), nullable=False)
     
     # Improvement details
     improvement_type = Column(String(50), nullable=False)  # document_update, model_retrain, prompt_engineering
     improvement_description = Column(Text, nullable=False)
     
     # Implementation details
-    implemented_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    implemented_by = Column(PortableUUID, ForeignKey("users.id"), nullable=True)
     implementation_date = Column(DateTime, default=datetime.utcnow)
     
     # Impact measurement
@@ -1,7 +1,7 @@
 """
 Social features related models for community interaction
 """
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 
 from app.db.models.base import Base, TimestampMixin
@@ -19,7 +19,12 @@ class SocialPost(Base, TimestampMixin):
     
     # Relationships
     user = relationship("User", back_populates="social_posts")
-    comments = relationship("SocialComment", back_populates="post", cascade="all, delete-orphan")
+    comments = relationship(
+        "SocialComment",
+        back_populates="post",
+        cascade="all, delete-orphan",
+        order_by="SocialComment.created_at"
+    )
     likes = relationship("SocialLike", back_populates="post", cascade="all, delete-orphan")
     tags = relationship("SocialPostTag", back_populates="post", cascade="all, delete-orphan")
 
@@ -42,6 +47,15 @@ class SocialComment(Base, TimestampMixin):
 class SocialLike(Base, TimestampMixin):
     """Like on a post or comment"""
     __tablename__ = "social_likes"
+    __table_args__ = (
+        # One like per user and target; NULLS NOT DISTINCT so the unused
+        # post_id / comment_id still takes part in the comparison
+        UniqueConstraint(
+            "user_id", "post_id", "comment_id",
+            name="uq_like_user_target",
+            postgresql_nulls_not_distinct=True
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -67,6 +81,10 @@ class SocialTag(Base, TimestampMixin):
 class SocialPostTag(Base, TimestampMixin):
     """Association between posts and tags"""
     __tablename__ = "social_post_tags"
+    __table_args__ = (
+        # Trending-tag counts group by tag_id without touching the heap
+        Index("ix_spt_tag_id", "tag_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     post_id = Column(Integer, ForeignKey("social_posts.id"), nullable=False)
@@ -75,3 +93,11 @@ class SocialPostTag(Base, TimestampMixin):
     # Relationships
     post = relationship("SocialPost", back_populates="tags")
     tag = relationship("SocialTag", back_populates="posts")
+
+
+# Per-user feed and per-post comment thread, both paged by created_at
+Index("ix_post_user_created", SocialPost.user_id, SocialPost.created_at.desc())
+Index("ix_comment_post_created", SocialComment.post_id, SocialComment.created_at)
+
+# Tag names are unique regardless of case
+Index("uq_social_tags_lower_name", func.lower(SocialTag.name), unique=True)
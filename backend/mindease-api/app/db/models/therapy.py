@@ -1,11 +1,10 @@
 """
 Therapy related models including sessions, exercises, and progress tracking
 """
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, DateTime, Float
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Text, DateTime, Float
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import JSONB
 
-from app.db.models.base import Base, TimestampMixin
+from app.db.models.base import Base, PortableJSONB, TimestampMixin
 
 class TherapySession(Base, TimestampMixin):
     """Therapy session model"""
@@ -24,6 +23,9 @@ class TherapySession(Base, TimestampMixin):
     user = relationship("User", back_populates="therapy_sessions")
     exercises = relationship("TherapyExercise", back_populates="session", cascade="all, delete-orphan")
 
+# A user's session history, newest first
+Index("ix_session_user_created", TherapySession.user_id, TherapySession.created_at.desc())
+
 class TherapyExercise(Base, TimestampMixin):
     """Individual therapy exercise within a session"""
     __tablename__ = "therapy_exercises"
@@ -33,8 +35,8 @@ class TherapyExercise(Base, TimestampMixin):
     exercise_type = Column(String(50), nullable=False)  # e.g., "4-7-8-breathing", "body-scan"
     duration_seconds = Column(Integer, nullable=True)
     completed = Column(Boolean, default=False)
-    settings = Column(JSONB, nullable=True)  # Exercise-specific settings
-    results = Column(JSONB, nullable=True)  # Exercise-specific results
+    settings = Column(PortableJSONB, nullable=True)  # Exercise-specific settings
+    results = Column(PortableJSONB, nullable=True)  # Exercise-specific results
     
     # Relationships
     session = relationship("TherapySession", back_populates="exercises")
@@ -65,7 +67,7 @@ class TherapyProgramActivity(Base, TimestampMixin):
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     duration_minutes = Column(Integer, nullable=True)
-    settings = Column(JSONB, nullable=True)
+    settings = Column(PortableJSONB, nullable=True)
     
     # Relationships
     program = relationship("TherapyProgram", back_populates="activities")
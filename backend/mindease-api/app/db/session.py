@@ -5,6 +5,7 @@ Database session management for the MindEase API.
 import logging
 import os
 from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.db.models import __all__  
 from app.core.config import settings
@@ -16,13 +17,24 @@ logger = logging.getLogger(__name__)
 
 DB_CONNECTION_STRING = str(settings.SQLALCHEMY_DATABASE_URI)
 
+# psycopg2 can also page executemany UPDATE/DELETE statements
+_driver_options = (
+    {"executemany_mode": "values_plus_batch"}
+    if make_url(DB_CONNECTION_STRING).get_driver_name() == "psycopg2"
+    else {}
+)
+
 # Create SQLAlchemy engine
 engine = create_engine(
     DB_CONNECTION_STRING,
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_pre_ping=True,      
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
     future=True,
+    **_driver_options,
 )
 
 # Create sessionmaker
@@ -7,6 +7,7 @@ on RAG-generated responses for continuous improvement.
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_
 
@@ -354,12 +355,14 @@ async def export_feedback(
     Export feedback data for analysis (admin only).
     """
     feedback_service = RAGFeedbackService(db)
-    return await feedback_service.export_feedback(
+    chunks = await feedback_service.stream_feedback_export(
         organization_id=current_admin.organization_id,
         format=format,
         days=days,
         include_text=include_text
     )
+    media_type = "text/csv" if format == "csv" else "application/json"
+    return StreamingResponse(chunks, media_type=media_type)
 
 
 @router.post("/admin/generate-training-data")
@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 from app.core.dependencies import get_db, get_current_admin_user
 from app.db.models.auth import User
 from app.services.rag_learning_service import RAGLearningService
-from app.services.rag_learning_framework import LearningMethod, LearningConfig
+from app.services.rag_learning_framework import LearningConfig, parse_learning_method
 from app.schemas.rag_learning import (
     LearningReadinessResponse,
     ExperimentCreateRequest,
@@ -84,8 +84,8 @@ async def start_learning_experiment(
         # Use user's organization if not specified
         organization_id = request.organization_id or current_user.organization_id
         
-        # Convert string method to enum if provided
-        method = LearningMethod(request.method) if request.method else None
+        # Validate the requested method name if provided
+        method = parse_learning_method(request.method.value) if request.method else None
         
         # Start experiment
         experiment_id = await service.start_learning_experiment(
@@ -100,7 +100,7 @@ async def start_learning_experiment(
             "experiment_id": experiment_id,
             "status": "started",
             "organization_id": organization_id,
-            "method": method.value if method else "auto_selected",
+            "method": method or "auto_selected",
             "message": "Learning experiment started successfully"
         }
         
@@ -2,6 +2,7 @@
 Social features router for posts, comments, likes, and community interaction
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc, func, or_
 from typing import List, Optional
@@ -17,6 +18,7 @@ from app.schemas.social import (
     SocialTagResponse, SocialFeedResponse
 )
 from app.core.security import get_current_active_user
+from app.core.cache import cache_manager
 
 # router = APIRouter(
 #     prefix="/social",
@@ -24,6 +26,23 @@ from app.core.security import get_current_active_user
 # )
 
 router = APIRouter(tags=[("social")])
+
+# Unfiltered post pages are identical for every user, so they are cached in
+# Redis briefly; post writes bump the version embedded in the page keys
+_FEED_CACHE_NAMESPACE = "social"
+_FEED_CACHE_TTL_SECONDS = 30
+
+
+async def _feed_cache_key(skip: int, limit: int) -> str:
+    """Build the cache key for an unfiltered posts page."""
+    version = await cache_manager.get("feed_version", namespace=_FEED_CACHE_NAMESPACE, default=0)
+    return f"feed:{version}:{limit}:{skip}"
+
+
+async def _invalidate_feed_cache() -> None:
+    """Stop serving cached post pages after a post is created or changed."""
+    await cache_manager.increment("feed_version", namespace=_FEED_CACHE_NAMESPACE)
+
 # Social Post Endpoints
 
 @router.post("/posts", response_model=SocialPostResponse, status_code=status.HTTP_201_CREATED)
@@ -63,6 +82,7 @@ async def create_social_post(
         db.commit()
         db.refresh(db_post)
     
+    await _invalidate_feed_cache()
     return db_post
 
 @router.get("/posts", response_model=List[SocialPostResponse])
@@ -82,6 +102,13 @@ async def get_social_posts(
     - Supports filtering by tag, search, and user's own posts
     - Anonymous posts show limited user information
     """
+    cacheable = not (my_posts or tag_id or search)
+    if cacheable:
+        cache_key = await _feed_cache_key(skip, limit)
+        cached_posts = await cache_manager.get(cache_key, namespace=_FEED_CACHE_NAMESPACE)
+        if cached_posts is not None:
+            return cached_posts
+    
     query = db.query(SocialPost).filter(SocialPost.is_active == True)
     
     if my_posts:
@@ -101,6 +128,14 @@ async def get_social_posts(
     
     posts = query.order_by(desc(SocialPost.created_at)).offset(skip).limit(limit).all()
     
+    if cacheable:
+        await cache_manager.set(
+            cache_key,
+            jsonable_encoder([SocialPostResponse.from_orm(post) for post in posts]),
+            expire=_FEED_CACHE_TTL_SECONDS,
+            namespace=_FEED_CACHE_NAMESPACE
+        )
+    
     return posts
 
 @router.get("/posts/{post_id}", response_model=SocialPostResponse)
@@ -174,6 +209,7 @@ async def update_social_post(
     db.commit()
     db.refresh(post)
     
+    await _invalidate_feed_cache()
     return post
 
 @router.delete("/posts/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -206,6 +242,7 @@ async def delete_social_post(
     post.updated_at = datetime.utcnow()
     
     db.commit()
+    await _invalidate_feed_cache()
 
 # Social Comment Endpoints
 
@@ -118,7 +118,7 @@ class OrganizationService:
             # return membership
             
             # New, corrected implementation:
-            org = self.db.query(Organization).get(organization_id)
+            org = self.db.get(Organization, organization_id)
             if not org:
                 logger.error(f"Organization {organization_id} not found")
                 return None
@@ -191,7 +191,7 @@ class OrganizationService:
                 return None
             if api_key.expires_at and api_key.expires_at < datetime.utcnow():
                 return None
-            return self.db.query(Organization).get(api_key.organization_id)
+            return self.db.get(Organization, api_key.organization_id)
         except Exception as e:
             logger.error(f"Error validating API key: {str(e)}")
             return None
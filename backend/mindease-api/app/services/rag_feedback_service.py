@@ -4,19 +4,28 @@ RAG Feedback Service
 Business logic for handling user feedback on RAG responses,
 analytics processing, and continuous improvement mechanisms.
 """
-import json
+import asyncio
 import csv
 import io
-from typing import List, Optional, Dict, Any, Tuple
+import threading
+import time
+import weakref
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Iterator
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
+from sqlalchemy import func, and_, or_, desc, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from uuid import UUID
 import statistics
 import logging
+import orjson
 
 from app.db.models.auth import User
-from app.db.models.rag_feedback import RAGFeedback, FeedbackAnalytics, FeedbackTrainingData, ResponseImprovement
+from app.db.models.rag_feedback import (
+    RAGFeedback, FeedbackAnalytics, FeedbackHourlyTile, FeedbackTrainingData, ResponseImprovement
+)
 from app.schemas.rag_feedback import (
     RAGFeedbackCreate, RAGFeedbackResponse, FeedbackAnalyticsResponse,
     FeedbackSummary, ResponseImprovementCreate, FeedbackTrends,
@@ -25,6 +34,126 @@ from app.schemas.rag_feedback import (
 
 logger = logging.getLogger(__name__)
 
+# One in-flight analytics backfill per period_type; FeedbackAnalytics rows are
+# not scoped by organization, so every org's backfill writes the same rows.
+# Entries disappear once no coroutine holds the lock
+_analytics_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _analytics_lock(period_type: str) -> asyncio.Lock:
+    """Return the shared backfill lock for a period type."""
+    lock = _analytics_locks.get(period_type)
+    if lock is None:
+        lock = asyncio.Lock()
+        _analytics_locks[period_type] = lock
+    return lock
+
+
+def _period_buckets(period_type: str, start_date, end_date) -> List[Tuple[datetime, datetime]]:
+    """
+    Return half-open [bucket_start, next_bucket_start) bounds in naive UTC for
+    every daily, weekly (Monday-based) or monthly bucket touching the date range.
+    """
+    if period_type == "daily":
+        current = start_date
+    elif period_type == "weekly":
+        current = start_date - timedelta(days=start_date.weekday())
+    elif period_type == "monthly":
+        current = start_date.replace(day=1)
+    else:
+        return []
+    
+    buckets = []
+    while current <= end_date:
+        if period_type == "daily":
+            following = current + timedelta(days=1)
+        elif period_type == "weekly":
+            following = current + timedelta(days=7)
+        elif current.month == 12:
+            following = current.replace(year=current.year + 1, month=1)
+        else:
+            following = current.replace(month=current.month + 1)
+        
+        buckets.append((
+            datetime.combine(current, datetime.min.time()),
+            datetime.combine(following, datetime.min.time())
+        ))
+        current = following
+    
+    return buckets
+
+
+# Columns read by the CSV/JSON exporters; selected directly to skip ORM hydration
+_EXPORT_COLUMNS = (
+    RAGFeedback.id, RAGFeedback.user_id, RAGFeedback.created_at,
+    RAGFeedback.overall_rating, RAGFeedback.relevance_score, RAGFeedback.helpfulness_score,
+    RAGFeedback.accuracy_score, RAGFeedback.clarity_score,
+    RAGFeedback.is_helpful, RAGFeedback.is_accurate, RAGFeedback.is_safe, RAGFeedback.is_empathetic,
+    RAGFeedback.query_intent, RAGFeedback.user_emotional_state, RAGFeedback.feedback_category
+)
+_EXPORT_TEXT_COLUMNS = (
+    RAGFeedback.user_query, RAGFeedback.rag_response,
+    RAGFeedback.feedback_text, RAGFeedback.suggested_improvement
+)
+
+# Serialized export payloads keyed by request filters plus a fingerprint of the
+# matching rows, so unchanged exports skip both the fetch and the encoding.
+# Bounded by total payload size, since include_text exports vary widely.
+_EXPORT_CACHE_MAXSIZE = 64
+_EXPORT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_EXPORT_CACHE_TTL_SECONDS = 300
+_export_cache: "OrderedDict[Tuple, Tuple[float, bytes]]" = OrderedDict()
+_export_cache_bytes = 0
+_export_cache_lock = threading.Lock()  # exports are rendered in worker threads
+
+# Exports above this many rows are streamed in batches instead of being
+# rendered (and cached) as a single in-memory payload
+_EXPORT_STREAM_THRESHOLD_ROWS = 5000
+_EXPORT_STREAM_BATCH_SIZE = 1000
+
+
+def _export_cache_get(key: Tuple) -> Optional[bytes]:
+    """Return a cached export payload if present and not expired."""
+    with _export_cache_lock:
+        entry = _export_cache.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, payload = entry
+        if time.monotonic() - stored_at > _EXPORT_CACHE_TTL_SECONDS:
+            _export_cache_discard(key)
+            return None
+        
+        _export_cache.move_to_end(key)
+        return payload
+
+
+def _export_cache_set(key: Tuple, payload: bytes) -> None:
+    """Store an export payload, evicting least recently used entries."""
+    global _export_cache_bytes
+    
+    if len(payload) > _EXPORT_CACHE_MAX_BYTES:
+        return  # Would evict everything else and still not fit
+    
+    with _export_cache_lock:
+        _export_cache_discard(key)
+        _export_cache[key] = (time.monotonic(), payload)
+        _export_cache_bytes += len(payload)
+        while (
+            len(_export_cache) > _EXPORT_CACHE_MAXSIZE
+            or _export_cache_bytes > _EXPORT_CACHE_MAX_BYTES
+        ):
+            _export_cache_discard(next(iter(_export_cache)))
+
+
+def _export_cache_discard(key: Tuple) -> None:
+    """Drop an entry and its bytes from the running total; caller holds the lock."""
+    global _export_cache_bytes
+    
+    entry = _export_cache.pop(key, None)
+    if entry is not None:
+        _export_cache_bytes -= len(entry[1])
+
 
 class RAGFeedbackService:
     """Service for managing RAG feedback and analytics."""
@@ -65,6 +194,11 @@ class RAGFeedbackService:
         )
         
         self.db.add(feedback)
+        self.db.flush()
+        
+        # Same transaction as the feedback row, so the tile never drifts from it
+        self._record_hourly_tile(feedback)
+        
         self.db.commit()
         self.db.refresh(feedback)
         
@@ -188,10 +322,14 @@ class RAGFeedbackService:
         
         analytics_records = analytics_query.all()
         
-        # If no analytics exist, generate them
+        # If no analytics exist, generate them; concurrent callers wait on the
+        # same backfill and re-check instead of repeating it
         if not analytics_records:
-            await self._generate_analytics(period_type, days, organization_id)
-            analytics_records = analytics_query.all()
+            async with _analytics_lock(period_type):
+                analytics_records = analytics_query.all()
+                if not analytics_records:
+                    await self._generate_analytics(period_type, days, organization_id)
+                    analytics_records = analytics_query.all()
         
         return [FeedbackAnalyticsResponse.from_orm(record) for record in analytics_records]
     
@@ -514,40 +652,44 @@ class RAGFeedbackService:
         if not feedback:
             return
         
-        # Update daily analytics
+        # Update daily analytics; half-open [day_start, next_day_start) ranges
+        # keep the created_at/period_start indexes usable
         today = datetime.utcnow().date()
-        analytics = self.db.query(FeedbackAnalytics)\
-            .filter(
-                FeedbackAnalytics.period_type == "daily",
-                func.date(FeedbackAnalytics.period_start) == today
-            ).first()
-        
-        if not analytics:
-            analytics = FeedbackAnalytics(
-                period_start=datetime.combine(today, datetime.min.time()),
-                period_end=datetime.combine(today, datetime.max.time()),
-                period_type="daily",
-                total_feedback_count=0
-            )
-            self.db.add(analytics)
-        
-        # Update analytics with new feedback
-        analytics.total_feedback_count += 1
+        day_start = datetime.combine(today, datetime.min.time())
+        next_day_start = day_start + timedelta(days=1)
         
         # Recalculate averages (simplified - in production, use incremental updates)
-        daily_feedback = self.db.query(RAGFeedback)\
-            .filter(func.date(RAGFeedback.created_at) == today)\
-            .all()
-        
-        if daily_feedback:
-            ratings = [f.overall_rating for f in daily_feedback if f.overall_rating]
-            if ratings:
-                analytics.avg_overall_rating = statistics.mean(ratings)
-            
-            relevance_scores = [f.relevance_score for f in daily_feedback if f.relevance_score]
-            if relevance_scores:
-                analytics.avg_relevance_score = statistics.mean(relevance_scores)
-        
+        avg_rating, avg_relevance = self.db.query(
+            func.avg(RAGFeedback.overall_rating),
+            func.avg(RAGFeedback.relevance_score)
+        ).filter(
+            RAGFeedback.created_at >= day_start,
+            RAGFeedback.created_at < next_day_start
+        ).one()
+        
+        # Upsert on uq_fa_type_start so a concurrent backfill or a second
+        # feedback for the same day bumps the existing row instead of failing
+        stmt = pg_insert(FeedbackAnalytics).values(
+            period_start=day_start,
+            period_end=datetime.combine(today, datetime.max.time()),
+            period_type="daily",
+            total_feedback_count=1,
+            avg_overall_rating=float(avg_rating) if avg_rating is not None else None,
+            avg_relevance_score=float(avg_relevance) if avg_relevance is not None else None
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_fa_type_start",
+            set_={
+                "total_feedback_count": func.coalesce(FeedbackAnalytics.total_feedback_count, 0) + 1,
+                "avg_overall_rating": func.coalesce(
+                    stmt.excluded.avg_overall_rating, FeedbackAnalytics.avg_overall_rating
+                ),
+                "avg_relevance_score": func.coalesce(
+                    stmt.excluded.avg_relevance_score, FeedbackAnalytics.avg_relevance_score
+                )
+            }
+        )
+        self.db.execute(stmt)
         self.db.commit()
         
         logger.info(f"Updated analytics for feedback {feedback_id}")
@@ -584,31 +726,56 @@ class RAGFeedbackService:
         
         logger.info(f"Created safety improvement task for feedback {feedback_id}")
     
-    async def export_feedback(
+    async def stream_feedback_export(
         self,
         organization_id: Optional[UUID] = None,
         format: str = "csv",
         days: int = 30,
         include_text: bool = True
-    ) -> str:
-        """Export feedback data for analysis."""
+    ) -> Iterator[bytes]:
+        """
+        Export feedback data as byte chunks for a streaming response.
+        
+        Small exports reuse the cached in-memory payload; larger ones are
+        fetched with yield_per and encoded row by row so memory stays flat.
+        The returned iterator is synchronous, so StreamingResponse drains it
+        in its threadpool.
+        """
+        
+        return await asyncio.to_thread(
+            self._open_export_stream, organization_id, format, days, include_text
+        )
+    
+    def _open_export_stream(
+        self,
+        organization_id: Optional[UUID],
+        format: str,
+        days: int,
+        include_text: bool
+    ) -> Iterator[bytes]:
+        """Blocking body of stream_feedback_export."""
         
-        start_date = datetime.utcnow() - timedelta(days=days)
+        query, cache_key = self._prepare_export(organization_id, format, days, include_text)
+        row_count = cache_key[4]
         
-        query = self.db.query(RAGFeedback)\
-            .filter(RAGFeedback.created_at >= start_date)
+        cached_payload = _export_cache_get(cache_key)
+        if cached_payload is not None:
+            return iter([cached_payload])
         
-        if organization_id:
-            query = query.join(User).filter(User.organization_id == organization_id)
+        if row_count <= _EXPORT_STREAM_THRESHOLD_ROWS:
+            payload = self._render_export(query, format, include_text)
+            _export_cache_set(cache_key, payload)
+            return iter([payload])
         
-        feedback_records = query.all()
+        columns = _EXPORT_COLUMNS + _EXPORT_TEXT_COLUMNS if include_text else _EXPORT_COLUMNS
+        rows = query.with_entities(*columns).yield_per(_EXPORT_STREAM_BATCH_SIZE)
         
         if format == "csv":
-            return self._export_to_csv(feedback_records, include_text)
-        elif format == "json":
-            return self._export_to_json(feedback_records, include_text)
-        else:
-            raise ValueError(f"Unsupported format: {format}")
+            return (
+                chunk.encode()
+                for chunk in self._iter_csv_chunks(rows, include_text, _EXPORT_STREAM_BATCH_SIZE)
+            )
+        return self._iter_json_chunks(rows)
     
     async def generate_training_data(
         self,
@@ -666,8 +833,8 @@ class RAGFeedbackService:
         
         # Simple word frequency analysis
         word_counts = {}
-        for text in texts:
-            words = text.lower().split()
+        for entry in texts:
+            words = entry.lower().split()
             for word in words:
                 if len(word) > 3:  # Filter short words
                     word_counts[word] = word_counts.get(word, 0) + 1
@@ -676,6 +843,41 @@ class RAGFeedbackService:
         sorted_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
         return [word for word, count in sorted_words[:10]]
     
+    def _record_hourly_tile(self, feedback: RAGFeedback):
+        """
+        Fold a flushed feedback record into its hourly rollup tile.
+        
+        Runs in the caller's transaction and does not commit. now() is the
+        transaction timestamp, the same value the feedback's created_at
+        default received, so both land in the same hour.
+        """
+        
+        rating = feedback.overall_rating
+        has_rating = rating is not None
+        
+        stmt = pg_insert(FeedbackHourlyTile).values(
+            hour=func.date_trunc("hour", func.now()),
+            organization_id=select(User.organization_id)
+                .where(User.id == feedback.user_id)
+                .scalar_subquery(),
+            feedback_count=1,
+            rating_count=1 if has_rating else 0,
+            rating_sum=rating if has_rating else 0,
+            rating_sqsum=rating * rating if has_rating else 0
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_fht_hour_org",
+            set_={
+                "feedback_count": FeedbackHourlyTile.feedback_count + stmt.excluded.feedback_count,
+                "rating_count": FeedbackHourlyTile.rating_count + stmt.excluded.rating_count,
+                "rating_sum": FeedbackHourlyTile.rating_sum + stmt.excluded.rating_sum,
+                "rating_sqsum": FeedbackHourlyTile.rating_sqsum + stmt.excluded.rating_sqsum,
+                "updated_at": func.now()
+            }
+        )
+        
+        self.db.execute(stmt)
+    
     def _calculate_impact_score(
         self,
         before_metrics: Dict[str, Any],
@@ -730,8 +932,53 @@ class RAGFeedbackService:
         
         return score
     
-    def _export_to_csv(self, feedback_records: List[RAGFeedback], include_text: bool) -> str:
-        """Export feedback to CSV format."""
+    def _prepare_export(
+        self,
+        organization_id: Optional[UUID],
+        format: str,
+        days: int,
+        include_text: bool
+    ) -> Tuple[Any, Tuple]:
+        """Build the export query and its cache key."""
+        
+        start_date = datetime.utcnow() - timedelta(days=days)
+        
+        query = self.db.query(RAGFeedback)\
+            .filter(RAGFeedback.created_at >= start_date)
+        
+        if organization_id:
+            query = query.join(User).filter(User.organization_id == organization_id)
+        
+        if format not in ("csv", "json"):
+            raise ValueError(f"Unsupported format: {format}")
+        
+        # Fingerprint the matching rows; any new feedback changes the key
+        row_count, latest_created_at = query.with_entities(
+            func.count(RAGFeedback.id),
+            func.max(RAGFeedback.created_at)
+        ).one()
+        cache_key = (organization_id, format, days, include_text, row_count, latest_created_at)
+        
+        return query, cache_key
+    
+    def _render_export(self, query, format: str, include_text: bool) -> bytes:
+        """Fetch the export columns and render them as a single payload."""
+        
+        columns = _EXPORT_COLUMNS + _EXPORT_TEXT_COLUMNS if include_text else _EXPORT_COLUMNS
+        feedback_records = query.with_entities(*columns).all()
+        
+        # Same encoders as the streamed path, so output doesn't change with size
+        if format == "csv":
+            return "".join(self._iter_csv_chunks(feedback_records, include_text)).encode()
+        return b"".join(self._iter_json_chunks(feedback_records))
+    
+    def _iter_csv_chunks(
+        self,
+        feedback_records: Iterable[Any],
+        include_text: bool,
+        chunk_rows: Optional[int] = None
+    ) -> Iterator[str]:
+        """Yield CSV text, flushing every chunk_rows rows when given."""
         
         output = io.StringIO()
         writer = csv.writer(output)
@@ -750,6 +997,7 @@ class RAGFeedbackService:
         writer.writerow(headers)
         
         # Data rows
+        pending_rows = 0
         for feedback in feedback_records:
             row = [
                 str(feedback.id), str(feedback.user_id), feedback.created_at.isoformat(),
@@ -766,43 +1014,25 @@ class RAGFeedbackService:
                 ])
             
             writer.writerow(row)
+            pending_rows += 1
+            
+            if chunk_rows and pending_rows >= chunk_rows:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+                pending_rows = 0
         
-        return output.getvalue()
+        yield output.getvalue()
     
-    def _export_to_json(self, feedback_records: List[RAGFeedback], include_text: bool) -> str:
-        """Export feedback to JSON format."""
+    def _iter_json_chunks(self, feedback_records: Iterable[Any]) -> Iterator[bytes]:
+        """Yield a JSON array one encoded record at a time."""
         
-        data = []
+        separator = b"\n"
+        yield b"["
         for feedback in feedback_records:
-            record = {
-                "id": str(feedback.id),
-                "user_id": str(feedback.user_id),
-                "created_at": feedback.created_at.isoformat(),
-                "overall_rating": feedback.overall_rating,
-                "relevance_score": feedback.relevance_score,
-                "helpfulness_score": feedback.helpfulness_score,
-                "accuracy_score": feedback.accuracy_score,
-                "clarity_score": feedback.clarity_score,
-                "is_helpful": feedback.is_helpful,
-                "is_accurate": feedback.is_accurate,
-                "is_safe": feedback.is_safe,
-                "is_empathetic": feedback.is_empathetic,
-                "query_intent": feedback.query_intent,
-                "user_emotional_state": feedback.user_emotional_state,
-                "feedback_category": feedback.feedback_category
-            }
-            
-            if include_text:
-                record.update({
-                    "user_query": feedback.user_query,
-                    "rag_response": feedback.rag_response,
-                    "feedback_text": feedback.feedback_text,
-                    "suggested_improvement": feedback.suggested_improvement
-                })
-            
-            data.append(record)
-        
-        return json.dumps(data, indent=2)
+            yield separator + orjson.dumps(feedback._asdict())
+            separator = b",\n"
+        yield b"\n]"
     
     async def _generate_analytics(
         self,
@@ -812,56 +1042,91 @@ class RAGFeedbackService:
     ):
         """Generate missing analytics records."""
         
+        # The session is synchronous; run the backfill off the event loop
+        await asyncio.to_thread(self._generate_analytics_sync, period_type, days, organization_id)
+    
+    def _generate_analytics_sync(
+        self,
+        period_type: str,
+        days: int,
+        organization_id: Optional[UUID] = None
+    ):
+        """Blocking body of _generate_analytics."""
+        
         # This would generate analytics for missing periods
         # Simplified implementation for demo
         
         start_date = datetime.utcnow() - timedelta(days=days)
+        buckets = _period_buckets(period_type, start_date.date(), datetime.utcnow().date())
         
-        if period_type == "daily":
-            current_date = start_date.date()
-            end_date = datetime.utcnow().date()
+        if not buckets:
+            return
+        
+        # One existence probe for all candidate buckets instead of one per bucket
+        candidate_starts = [bucket_start for bucket_start, _ in buckets]
+        existing = {
+            period_start
+            for (period_start,) in self.db.query(FeedbackAnalytics.period_start)
+            .filter(
+                FeedbackAnalytics.period_type == period_type,
+                FeedbackAnalytics.period_start.in_(candidate_starts)
+            ).all()
+        }
+        
+        missing = [bucket for bucket in buckets if bucket[0] not in existing]
+        if not missing:
+            return
+        
+        # Roll the missing buckets up from hourly tiles in a single scan rather
+        # than aggregating raw feedback once per bucket
+        tiles = self.db.query(
+            FeedbackHourlyTile.hour,
+            FeedbackHourlyTile.feedback_count,
+            FeedbackHourlyTile.rating_count,
+            FeedbackHourlyTile.rating_sum
+        ).filter(
+            FeedbackHourlyTile.hour >= missing[0][0],
+            FeedbackHourlyTile.hour < missing[-1][1]
+        )
+        
+        if organization_id:
+            tiles = tiles.filter(FeedbackHourlyTile.organization_id == organization_id)
+        
+        missing_starts = [bucket_start for bucket_start, _ in missing]
+        totals = {bucket_start: [0, 0, 0.0] for bucket_start in missing_starts}
+        
+        for hour, feedback_count, rating_count, rating_sum in tiles.all():
+            index = bisect_right(missing_starts, hour) - 1
+            if index < 0 or hour >= missing[index][1]:
+                continue  # Tile falls in a bucket that already exists
             
-            while current_date <= end_date:
-                # Check if analytics exist for this day
-                existing = self.db.query(FeedbackAnalytics)\
-                    .filter(
-                        FeedbackAnalytics.period_type == "daily",
-                        func.date(FeedbackAnalytics.period_start) == current_date
-                    ).first()
-                
-                if not existing:
-                    # Create analytics for this day
-                    day_start = datetime.combine(current_date, datetime.min.time())
-                    day_end = datetime.combine(current_date, datetime.max.time())
-                    
-                    # Get feedback for this day
-                    query = self.db.query(RAGFeedback)\
-                        .filter(
-                            RAGFeedback.created_at >= day_start,
-                            RAGFeedback.created_at <= day_end
-                        )
-                    
-                    if organization_id:
-                        query = query.join(User).filter(User.organization_id == organization_id)
-                    
-                    daily_feedback = query.all()
-                    
-                    # Calculate metrics
-                    analytics = FeedbackAnalytics(
-                        period_start=day_start,
-                        period_end=day_end,
-                        period_type="daily",
-                        total_feedback_count=len(daily_feedback)
-                    )
-                    
-                    if daily_feedback:
-                        ratings = [f.overall_rating for f in daily_feedback if f.overall_rating]
-                        if ratings:
-                            analytics.avg_overall_rating = statistics.mean(ratings)
-                    
-                    self.db.add(analytics)
-                
-                current_date += timedelta(days=1)
+            bucket_totals = totals[missing_starts[index]]
+            bucket_totals[0] += feedback_count
+            bucket_totals[1] += rating_count
+            bucket_totals[2] += rating_sum
+        
+        rows = []
+        for bucket_start, next_bucket_start in missing:
+            feedback_count, rating_count, rating_sum = totals[bucket_start]
             
-            self.db.commit()
-
+            # Calculate metrics
+            rows.append({
+                "period_start": bucket_start,
+                "period_end": next_bucket_start - timedelta(microseconds=1),
+                "period_type": period_type,
+                "total_feedback_count": feedback_count,
+                "avg_overall_rating": rating_sum / rating_count if rating_count else None
+            })
+        
+        if not rows:
+            return
+        
+        # Rollup rows are recomputable from raw feedback, so skip the WAL flush
+        # wait for this transaction only
+        self.db.execute(text("SET LOCAL synchronous_commit = off"))
+        
+        # uq_fa_type_start dedupes buckets a concurrent writer inserted after the probe
+        stmt = pg_insert(FeedbackAnalytics).values(rows)\
+            .on_conflict_do_nothing(index_elements=["period_type", "period_start"])
+        self.db.execute(stmt)
+        self.db.commit()
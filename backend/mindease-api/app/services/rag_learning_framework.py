@@ -4,42 +4,146 @@ RAG Learning Framework for MindEase
 Continuous learning system for improving RAG responses through
 supervised fine-tuning, reinforcement learning, and feedback integration.
 """
-import json
+import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+import os
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Literal, NamedTuple, Optional, Tuple, Any, get_args
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 import numpy as np
-from dataclasses import dataclass
-from enum import Enum
+import orjson
+from dataclasses import asdict, dataclass
 
 # Learning framework configuration
 logger = logging.getLogger(__name__)
 
+# Experiment artifacts in the order they are written; the last one present
+# determines the reported status
+_EXPERIMENT_FILES = (
+    ("config", "config.json", "configured"),
+    ("results", "results.json", "completed"),
+    ("evaluation", "evaluation.json", "evaluated"),
+    ("deployment", "deployment.json", "deployed"),
+    ("error", "error.json", "failed"),
+)
 
-class LearningMethod(str, Enum):
-    """Available learning methods for RAG improvement."""
-    SUPERVISED_FINE_TUNING = "supervised_fine_tuning"
-    REINFORCEMENT_LEARNING = "reinforcement_learning"
-    PARAMETER_EFFICIENT_FINE_TUNING = "peft"  # LoRA, AdaLoRA, etc.
-    RETRIEVAL_AUGMENTED_FINE_TUNING = "raft"
-    DIRECT_PREFERENCE_OPTIMIZATION = "dpo"
-    CONSTITUTIONAL_AI = "constitutional_ai"
 
+def _write_json(path: Path, data: Any) -> None:
+    """Serialize with orjson and write the file in a single call."""
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
 
-class ModelType(str, Enum):
-    """Types of models that can be fine-tuned."""
-    EMBEDDING_MODEL = "embedding_model"
-    LANGUAGE_MODEL = "language_model"
-    RETRIEVAL_MODEL = "retrieval_model"
-    RANKING_MODEL = "ranking_model"
 
+def _init_experiment_dir(experiment_dir: Path, experiment_config: Dict[str, Any]) -> None:
+    """Create an experiment directory and write its config.json."""
+    experiment_dir.mkdir(exist_ok=True)
+    _write_json(experiment_dir / "config.json", experiment_config)
 
-@dataclass
+
+def _read_json(path: Path) -> Any:
+    """Read and parse a JSON file with orjson."""
+    return orjson.loads(path.read_bytes())
+
+
+@lru_cache(maxsize=4096)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a JSON file, memoized on its stat signature so rewritten files miss.
+    
+    The returned object is shared between callers and must not be mutated.
+    """
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def _read_json_if_exists(path: Path) -> Optional[Any]:
+    """Read a JSON file through the stat-keyed cache, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+        return _load_json_cached(str(path), st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return None
+
+
+def _read_experiment_artifacts(experiment_dir: Path) -> Optional[List[Tuple[str, str, Any]]]:
+    """
+    Read the artifacts present in an experiment directory using one scandir pass.
+    
+    Returns (key, stage, payload) tuples in write order, or None if the
+    directory does not exist.
+    """
+    try:
+        with os.scandir(experiment_dir) as entries:
+            present = {entry.name: entry for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    
+    artifacts = []
+    for key, filename, stage in _EXPERIMENT_FILES:
+        entry = present.get(filename)
+        if entry is None:
+            continue
+        try:
+            st = entry.stat()
+            payload = _load_json_cached(entry.path, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            continue
+        artifacts.append((key, stage, payload))
+    return artifacts
+
+
+LearningMethodName = Literal[
+    "supervised_fine_tuning",
+    "reinforcement_learning",
+    "peft",
+    "raft",
+    "dpo",
+    "constitutional_ai",
+]
+
+ModelTypeName = Literal[
+    "embedding_model",
+    "language_model",
+    "retrieval_model",
+    "ranking_model",
+]
+
+
+class LearningMethod:
+    """Available learning methods for RAG improvement (plain string constants)."""
+    SUPERVISED_FINE_TUNING: LearningMethodName = "supervised_fine_tuning"
+    REINFORCEMENT_LEARNING: LearningMethodName = "reinforcement_learning"
+    PARAMETER_EFFICIENT_FINE_TUNING: LearningMethodName = "peft"  # LoRA, AdaLoRA, etc.
+    RETRIEVAL_AUGMENTED_FINE_TUNING: LearningMethodName = "raft"
+    DIRECT_PREFERENCE_OPTIMIZATION: LearningMethodName = "dpo"
+    CONSTITUTIONAL_AI: LearningMethodName = "constitutional_ai"
+
+
+class ModelType:
+    """Types of models that can be fine-tuned (plain string constants)."""
+    EMBEDDING_MODEL: ModelTypeName = "embedding_model"
+    LANGUAGE_MODEL: ModelTypeName = "language_model"
+    RETRIEVAL_MODEL: ModelTypeName = "retrieval_model"
+    RANKING_MODEL: ModelTypeName = "ranking_model"
+
+
+_LEARNING_METHODS: FrozenSet[str] = frozenset(get_args(LearningMethodName))
+
+
+def parse_learning_method(value: str) -> LearningMethodName:
+    """Validate a learning method name, raising ValueError for unknown values."""
+    if value not in _LEARNING_METHODS:
+        raise ValueError(f"Unsupported learning method: {value}")
+    return value
+
+
+@dataclass(slots=True)
 class LearningConfig:
     """Configuration for learning experiments."""
-    method: LearningMethod
-    model_type: ModelType
+    method: LearningMethodName
+    model_type: ModelTypeName
     base_model: str
     learning_rate: float
     batch_size: int
@@ -57,7 +161,58 @@ class LearningConfig:
             self.target_modules = ["q_proj", "v_proj", "k_proj", "o_proj"]
 
 
-@dataclass
+# Default hyperparameters per learning method: (config section for the base
+# model, LearningConfig fields)
+_METHOD_PRESETS: Dict[LearningMethodName, Tuple[str, Dict[str, Any]]] = {
+    LearningMethod.CONSTITUTIONAL_AI: ("language_models", {
+        "model_type": ModelType.LANGUAGE_MODEL,
+        "learning_rate": 1e-5,
+        "batch_size": 8,
+        "num_epochs": 3,
+        "early_stopping_patience": 2
+    }),
+    LearningMethod.PARAMETER_EFFICIENT_FINE_TUNING: ("embedding_models", {
+        "model_type": ModelType.EMBEDDING_MODEL,
+        "learning_rate": 3e-4,
+        "batch_size": 16,
+        "num_epochs": 5,
+        "early_stopping_patience": 3,
+        "use_lora": True,
+        "lora_rank": 16,
+        "lora_alpha": 32
+    }),
+    LearningMethod.DIRECT_PREFERENCE_OPTIMIZATION: ("language_models", {
+        "model_type": ModelType.LANGUAGE_MODEL,
+        "learning_rate": 1e-6,
+        "batch_size": 4,
+        "num_epochs": 3,
+        "early_stopping_patience": 2
+    }),
+    LearningMethod.RETRIEVAL_AUGMENTED_FINE_TUNING: ("embedding_models", {
+        "model_type": ModelType.RETRIEVAL_MODEL,
+        "learning_rate": 2e-5,
+        "batch_size": 12,
+        "num_epochs": 4,
+        "early_stopping_patience": 3
+    }),
+    LearningMethod.REINFORCEMENT_LEARNING: ("language_models", {
+        "model_type": ModelType.LANGUAGE_MODEL,
+        "learning_rate": 1e-5,
+        "batch_size": 8,
+        "num_epochs": 10,
+        "early_stopping_patience": 5
+    }),
+    LearningMethod.SUPERVISED_FINE_TUNING: ("language_models", {
+        "model_type": ModelType.LANGUAGE_MODEL,
+        "learning_rate": 2e-5,
+        "batch_size": 16,
+        "num_epochs": 3,
+        "early_stopping_patience": 2
+    }),
+}
+
+
+@dataclass(slots=True)
 class TrainingData:
     """Structure for training data derived from feedback."""
     query: str
@@ -71,6 +226,54 @@ class TrainingData:
     context_metadata: Dict[str, Any]
 
 
+class FeedbackSummary(NamedTuple):
+    """Batch-level signals used for learning method selection."""
+    total: int
+    avg_quality: float
+    safety_issues: int
+    any_interactive: bool
+    any_suggestions: bool
+
+
+@dataclass
+class FeedbackArrays:
+    """Structure-of-arrays view over a batch of TrainingData for vectorized stats."""
+    feedback: np.ndarray
+    safety: np.ndarray
+    relevance: np.ndarray
+    conversation_length: np.ndarray
+    has_suggestions: np.ndarray
+    
+    @classmethod
+    def from_feedback(cls, feedback_data: List[TrainingData]) -> "FeedbackArrays":
+        """Populate all arrays in a single pass over the batch."""
+        n = len(feedback_data)
+        feedback = np.empty(n, dtype=np.float64)
+        safety = np.empty(n, dtype=np.float64)
+        relevance = np.empty(n, dtype=np.float64)
+        conversation_length = np.empty(n, dtype=np.int32)
+        has_suggestions = np.empty(n, dtype=bool)
+        
+        for i, d in enumerate(feedback_data):
+            feedback[i] = d.feedback_score
+            safety[i] = d.safety_score
+            relevance[i] = d.relevance_score
+            conversation_length[i] = d.context_metadata.get("conversation_length", 0)
+            has_suggestions[i] = len(d.improvement_suggestions) > 0
+        
+        return cls(feedback, safety, relevance, conversation_length, has_suggestions)
+    
+    def summarize(self) -> FeedbackSummary:
+        """Reduce the arrays to the selection signals."""
+        return FeedbackSummary(
+            total=len(self.feedback),
+            avg_quality=self.feedback.mean(),
+            safety_issues=int((self.safety < 0.9).sum()),
+            any_interactive=bool((self.conversation_length > 1).any()),
+            any_suggestions=bool(self.has_suggestions.any())
+        )
+
+
 class RAGLearningFramework:
     """
     Framework for continuous learning and improvement of RAG systems
@@ -91,15 +294,20 @@ class RAGLearningFramework:
         # Load configuration
         self.config = self._load_config()
         
-        # Initialize learning methods
-        self.learning_methods = {
-            LearningMethod.SUPERVISED_FINE_TUNING: SupervisedFineTuning(),
-            LearningMethod.PARAMETER_EFFICIENT_FINE_TUNING: ParameterEfficientFineTuning(),
-            LearningMethod.REINFORCEMENT_LEARNING: ReinforcementLearning(),
-            LearningMethod.RETRIEVAL_AUGMENTED_FINE_TUNING: RetrievalAugmentedFineTuning(),
-            LearningMethod.DIRECT_PREFERENCE_OPTIMIZATION: DirectPreferenceOptimization(),
-            LearningMethod.CONSTITUTIONAL_AI: ConstitutionalAI()
+        # Last feedback batch and its arrays; holding the list keeps the
+        # identity check safe against id() reuse
+        self._arrays_cache: Optional[Tuple[List[TrainingData], FeedbackArrays]] = None
+        
+        # Learning method implementations, instantiated on first use
+        self._method_classes = {
+            LearningMethod.SUPERVISED_FINE_TUNING: SupervisedFineTuning,
+            LearningMethod.PARAMETER_EFFICIENT_FINE_TUNING: ParameterEfficientFineTuning,
+            LearningMethod.REINFORCEMENT_LEARNING: ReinforcementLearning,
+            LearningMethod.RETRIEVAL_AUGMENTED_FINE_TUNING: RetrievalAugmentedFineTuning,
+            LearningMethod.DIRECT_PREFERENCE_OPTIMIZATION: DirectPreferenceOptimization,
+            LearningMethod.CONSTITUTIONAL_AI: ConstitutionalAI
         }
+        self._method_instances: Dict[LearningMethodName, "LearningMethodBase"] = {}
         
         logger.info("RAG Learning Framework initialized")
     
@@ -131,18 +339,16 @@ class RAGLearningFramework:
         }
         
         try:
-            if Path(self.config_path).exists():
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
+            # Parsed file is shared across instances until its mtime changes
+            config = _read_json_if_exists(Path(self.config_path))
+            if config is not None:
                 # Merge with defaults
-                for key, value in default_config.items():
-                    if key not in config:
-                        config[key] = value
-                return config
+                return {**default_config, **config}
             else:
                 # Save default config
-                with open(self.config_path, 'w') as f:
-                    json.dump(default_config, f, indent=2)
+                Path(self.config_path).write_bytes(
+                    orjson.dumps(default_config, option=orjson.OPT_INDENT_2)
+                )
                 return default_config
         except Exception as e:
             logger.warning(f"Failed to load config: {e}. Using defaults.")
@@ -153,14 +359,16 @@ class RAGLearningFramework:
         feedback_data: List[TrainingData],
         current_performance: Dict[str, float],
         improvement_goals: Dict[str, float]
-    ) -> Tuple[LearningMethod, LearningConfig]:
+    ) -> Tuple[LearningMethodName, LearningConfig]:
         """
         Select the most appropriate learning method based on data and goals.
         """
         
-        data_size = len(feedback_data)
-        avg_quality = np.mean([d.feedback_score for d in feedback_data])
-        safety_issues = sum(1 for d in feedback_data if d.safety_score < 0.9)
+        summary = self._feedback_arrays(feedback_data).summarize()
+        
+        data_size = summary.total
+        avg_quality = summary.avg_quality
+        safety_issues = summary.safety_issues
         
         logger.info(f"Selecting learning method for {data_size} samples, avg quality: {avg_quality:.3f}")
         
@@ -169,100 +377,55 @@ class RAGLearningFramework:
         # 1. If safety issues are prevalent, use Constitutional AI
         if safety_issues / data_size > 0.1:
             logger.info("High safety concerns detected, selecting Constitutional AI")
-            return LearningMethod.CONSTITUTIONAL_AI, LearningConfig(
-                method=LearningMethod.CONSTITUTIONAL_AI,
-                model_type=ModelType.LANGUAGE_MODEL,
-                base_model=self.config["language_models"]["base_model"],
-                learning_rate=1e-5,
-                batch_size=8,
-                num_epochs=3,
-                validation_split=0.2,
-                early_stopping_patience=2
-            )
+            chosen_method = LearningMethod.CONSTITUTIONAL_AI
         
         # 2. If we have limited data, use Parameter Efficient Fine-Tuning (LoRA)
         elif data_size < 500:
             logger.info("Limited data available, selecting PEFT with LoRA")
-            return LearningMethod.PARAMETER_EFFICIENT_FINE_TUNING, LearningConfig(
-                method=LearningMethod.PARAMETER_EFFICIENT_FINE_TUNING,
-                model_type=ModelType.EMBEDDING_MODEL,
-                base_model=self.config["embedding_models"]["base_model"],
-                learning_rate=3e-4,
-                batch_size=16,
-                num_epochs=5,
-                validation_split=0.2,
-                early_stopping_patience=3,
-                use_lora=True,
-                lora_rank=16,
-                lora_alpha=32
-            )
+            chosen_method = LearningMethod.PARAMETER_EFFICIENT_FINE_TUNING
         
         # 3. If we have preference data (comparative feedback), use DPO
-        elif self._has_preference_data(feedback_data):
+        elif self._has_preference_data(summary):
             logger.info("Preference data available, selecting Direct Preference Optimization")
-            return LearningMethod.DIRECT_PREFERENCE_OPTIMIZATION, LearningConfig(
-                method=LearningMethod.DIRECT_PREFERENCE_OPTIMIZATION,
-                model_type=ModelType.LANGUAGE_MODEL,
-                base_model=self.config["language_models"]["base_model"],
-                learning_rate=1e-6,
-                batch_size=4,
-                num_epochs=3,
-                validation_split=0.2,
-                early_stopping_patience=2
-            )
+            chosen_method = LearningMethod.DIRECT_PREFERENCE_OPTIMIZATION
         
         # 4. If we have good quality data and want to improve retrieval, use RAFT
         elif avg_quality > 0.7 and "retrieval_accuracy" in improvement_goals:
             logger.info("Good quality data for retrieval improvement, selecting RAFT")
-            return LearningMethod.RETRIEVAL_AUGMENTED_FINE_TUNING, LearningConfig(
-                method=LearningMethod.RETRIEVAL_AUGMENTED_FINE_TUNING,
-                model_type=ModelType.RETRIEVAL_MODEL,
-                base_model=self.config["embedding_models"]["base_model"],
-                learning_rate=2e-5,
-                batch_size=12,
-                num_epochs=4,
-                validation_split=0.2,
-                early_stopping_patience=3
-            )
+            chosen_method = LearningMethod.RETRIEVAL_AUGMENTED_FINE_TUNING
         
         # 5. If we have interactive feedback, use Reinforcement Learning
-        elif self._has_interactive_feedback(feedback_data):
+        elif self._has_interactive_feedback(summary):
             logger.info("Interactive feedback available, selecting Reinforcement Learning")
-            return LearningMethod.REINFORCEMENT_LEARNING, LearningConfig(
-                method=LearningMethod.REINFORCEMENT_LEARNING,
-                model_type=ModelType.LANGUAGE_MODEL,
-                base_model=self.config["language_models"]["base_model"],
-                learning_rate=1e-5,
-                batch_size=8,
-                num_epochs=10,
-                validation_split=0.2,
-                early_stopping_patience=5
-            )
+            chosen_method = LearningMethod.REINFORCEMENT_LEARNING
         
         # 6. Default to Supervised Fine-Tuning
         else:
             logger.info("Using default Supervised Fine-Tuning")
-            return LearningMethod.SUPERVISED_FINE_TUNING, LearningConfig(
-                method=LearningMethod.SUPERVISED_FINE_TUNING,
-                model_type=ModelType.LANGUAGE_MODEL,
-                base_model=self.config["language_models"]["base_model"],
-                learning_rate=2e-5,
-                batch_size=16,
-                num_epochs=3,
-                validation_split=0.2,
-                early_stopping_patience=2
-            )
+            chosen_method = LearningMethod.SUPERVISED_FINE_TUNING
+        
+        return chosen_method, self._build_config(chosen_method)
+    
+    def _build_config(self, method: LearningMethodName) -> LearningConfig:
+        """Build the default LearningConfig for a method from its preset."""
+        models_key, preset = _METHOD_PRESETS[method]
+        return LearningConfig(
+            method=method,
+            base_model=self.config[models_key]["base_model"],
+            validation_split=0.2,
+            **preset
+        )
     
     def prepare_training_data(
         self,
         feedback_data: List[TrainingData],
-        method: LearningMethod
+        method: LearningMethodName
     ) -> Dict[str, Any]:
         """
         Prepare training data in the format required by the selected learning method.
         """
         
-        logger.info(f"Preparing training data for {method.value}")
+        logger.info(f"Preparing training data for {method}")
         
         if method == LearningMethod.SUPERVISED_FINE_TUNING:
             return self._prepare_supervised_data(feedback_data)
@@ -285,9 +448,9 @@ class RAGLearningFramework:
         else:
             raise ValueError(f"Unsupported learning method: {method}")
     
-    def start_training(
+    async def start_training(
         self,
-        method: LearningMethod,
+        method: LearningMethodName,
         config: LearningConfig,
         training_data: Dict[str, Any]
     ) -> str:
@@ -298,38 +461,41 @@ class RAGLearningFramework:
             experiment_id: Unique identifier for tracking the experiment
         """
         
-        experiment_id = f"{method.value}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Nanosecond suffix keeps ids unique for back-to-back starts
+        experiment_id = f"{method}_{time.time_ns()}"
         experiment_dir = self.experiments_dir / experiment_id
-        experiment_dir.mkdir(exist_ok=True)
         
         logger.info(f"Starting training experiment: {experiment_id}")
         
+        samples = training_data.get("samples", [])
+        qualities = np.fromiter(
+            (s.get("quality", 0) for s in samples), dtype=np.float64, count=len(samples)
+        )
+        
         # Save experiment configuration
         experiment_config = {
             "experiment_id": experiment_id,
-            "method": method.value,
-            "config": config.__dict__,
+            "method": method,
+            "config": asdict(config),
             "data_stats": {
-                "num_samples": len(training_data.get("samples", [])),
-                "avg_quality": np.mean([s.get("quality", 0) for s in training_data.get("samples", [])]),
+                "num_samples": len(samples),
+                "avg_quality": qualities.mean(),
                 "data_types": list(training_data.keys())
             },
             "start_time": datetime.now().isoformat()
         }
         
-        with open(experiment_dir / "config.json", 'w') as f:
-            json.dump(experiment_config, f, indent=2)
+        await asyncio.to_thread(_init_experiment_dir, experiment_dir, experiment_config)
         
         # Get the appropriate learning method implementation
-        learning_impl = self.learning_methods[method]
+        learning_impl = self._get_impl(method)
         
-        # Start training (this would be async in production)
+        # Start training
         try:
-            results = learning_impl.train(config, training_data, experiment_dir)
+            results = await learning_impl.train(config, training_data, experiment_dir)
             
             # Save results
-            with open(experiment_dir / "results.json", 'w') as f:
-                json.dump(results, f, indent=2)
+            await asyncio.to_thread(_write_json, experiment_dir / "results.json", results)
             
             logger.info(f"Training completed for experiment: {experiment_id}")
             return experiment_id
@@ -337,11 +503,14 @@ class RAGLearningFramework:
         except Exception as e:
             logger.error(f"Training failed for experiment {experiment_id}: {e}")
             # Save error information
-            with open(experiment_dir / "error.json", 'w') as f:
-                json.dump({"error": str(e), "timestamp": datetime.now().isoformat()}, f)
+            await asyncio.to_thread(
+                _write_json,
+                experiment_dir / "error.json",
+                {"error": str(e), "timestamp": datetime.now().isoformat()}
+            )
             raise
     
-    def evaluate_model(
+    async def evaluate_model(
         self,
         experiment_id: str,
         test_data: List[TrainingData]
@@ -356,23 +525,21 @@ class RAGLearningFramework:
             raise ValueError(f"Experiment {experiment_id} not found")
         
         # Load experiment configuration
-        with open(experiment_dir / "config.json", 'r') as f:
-            experiment_config = json.load(f)
+        experiment_config = await asyncio.to_thread(_read_json, experiment_dir / "config.json")
         
-        method = LearningMethod(experiment_config["method"])
-        learning_impl = self.learning_methods[method]
+        method = parse_learning_method(experiment_config["method"])
+        learning_impl = self._get_impl(method)
         
         # Evaluate the model
-        evaluation_results = learning_impl.evaluate(experiment_dir, test_data)
+        evaluation_results = await learning_impl.evaluate(experiment_dir, test_data)
         
         # Save evaluation results
-        with open(experiment_dir / "evaluation.json", 'w') as f:
-            json.dump(evaluation_results, f, indent=2)
+        await asyncio.to_thread(_write_json, experiment_dir / "evaluation.json", evaluation_results)
         
         logger.info(f"Evaluation completed for experiment: {experiment_id}")
         return evaluation_results
     
-    def deploy_model(
+    async def deploy_model(
         self,
         experiment_id: str,
         deployment_config: Optional[Dict[str, Any]] = None
@@ -387,110 +554,94 @@ class RAGLearningFramework:
             raise ValueError(f"Experiment {experiment_id} not found")
         
         # Load experiment configuration
-        with open(experiment_dir / "config.json", 'r') as f:
-            experiment_config = json.load(f)
+        experiment_config = await asyncio.to_thread(_read_json, experiment_dir / "config.json")
         
-        method = LearningMethod(experiment_config["method"])
-        learning_impl = self.learning_methods[method]
+        method = parse_learning_method(experiment_config["method"])
+        learning_impl = self._get_impl(method)
         
         # Deploy the model
-        deployment_info = learning_impl.deploy(experiment_dir, deployment_config)
+        deployment_info = await learning_impl.deploy(experiment_dir, deployment_config)
         
         # Save deployment information
-        with open(experiment_dir / "deployment.json", 'w') as f:
-            json.dump(deployment_info, f, indent=2)
+        await asyncio.to_thread(_write_json, experiment_dir / "deployment.json", deployment_info)
         
         logger.info(f"Model deployed for experiment: {experiment_id}")
         return deployment_info["model_path"]
     
-    def get_experiment_status(self, experiment_id: str) -> Dict[str, Any]:
+    async def get_experiment_status(self, experiment_id: str) -> Dict[str, Any]:
         """Get the status of a training experiment."""
         
         experiment_dir = self.experiments_dir / experiment_id
         
-        if not experiment_dir.exists():
+        artifacts = await asyncio.to_thread(_read_experiment_artifacts, experiment_dir)
+        if artifacts is None:
             return {"status": "not_found"}
         
         status = {"status": "unknown", "experiment_id": experiment_id}
         
-        # Check for configuration
-        config_file = experiment_dir / "config.json"
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                status["config"] = json.load(f)
-            status["status"] = "configured"
-        
-        # Check for results
-        results_file = experiment_dir / "results.json"
-        if results_file.exists():
-            with open(results_file, 'r') as f:
-                status["results"] = json.load(f)
-            status["status"] = "completed"
-        
-        # Check for evaluation
-        eval_file = experiment_dir / "evaluation.json"
-        if eval_file.exists():
-            with open(eval_file, 'r') as f:
-                status["evaluation"] = json.load(f)
-            status["status"] = "evaluated"
-        
-        # Check for deployment
-        deploy_file = experiment_dir / "deployment.json"
-        if deploy_file.exists():
-            with open(deploy_file, 'r') as f:
-                status["deployment"] = json.load(f)
-            status["status"] = "deployed"
-        
-        # Check for errors
-        error_file = experiment_dir / "error.json"
-        if error_file.exists():
-            with open(error_file, 'r') as f:
-                status["error"] = json.load(f)
-            status["status"] = "failed"
+        # Later stages override earlier ones
+        for key, stage, payload in artifacts:
+            status[key] = payload
+            status["status"] = stage
         
         return status
     
-    def list_experiments(self) -> List[Dict[str, Any]]:
+    async def list_experiments(self) -> List[Dict[str, Any]]:
         """List all training experiments."""
         
-        experiments = []
+        with os.scandir(self.experiments_dir) as entries:
+            experiment_ids = [entry.name for entry in entries if entry.is_dir()]
         
-        for experiment_dir in self.experiments_dir.iterdir():
-            if experiment_dir.is_dir():
-                status = self.get_experiment_status(experiment_dir.name)
-                experiments.append(status)
+        experiments = await asyncio.gather(
+            *(self.get_experiment_status(experiment_id) for experiment_id in experiment_ids)
+        )
         
         return sorted(experiments, key=lambda x: x.get("config", {}).get("start_time", ""), reverse=True)
     
+    def _get_impl(self, method: LearningMethodName) -> "LearningMethodBase":
+        """Return the implementation for a learning method, creating it on first access."""
+        impl = self._method_instances.get(method)
+        if impl is None:
+            impl = self._method_instances[method] = self._method_classes[method]()
+        return impl
+    
     # Helper methods for data preparation
     
-    def _has_preference_data(self, feedback_data: List[TrainingData]) -> bool:
+    def _feedback_arrays(self, feedback_data: List[TrainingData]) -> FeedbackArrays:
+        """Return the SoA view for a feedback batch, reusing it for the same list."""
+        cached = self._arrays_cache
+        if cached is not None and cached[0] is feedback_data and len(cached[1].feedback) == len(feedback_data):
+            return cached[1]
+        
+        arrays = FeedbackArrays.from_feedback(feedback_data)
+        self._arrays_cache = (feedback_data, arrays)
+        return arrays
+    
+    def _has_preference_data(self, summary: FeedbackSummary) -> bool:
         """Check if we have comparative preference data."""
         # In a real implementation, this would check for paired comparisons
-        return len(feedback_data) > 50 and any(
-            len(d.improvement_suggestions) > 0 for d in feedback_data
-        )
+        return summary.total > 50 and summary.any_suggestions
     
-    def _has_interactive_feedback(self, feedback_data: List[TrainingData]) -> bool:
+    def _has_interactive_feedback(self, summary: FeedbackSummary) -> bool:
         """Check if we have interactive/conversational feedback."""
         # Check for multi-turn conversations or interactive ratings
-        return any(
-            d.context_metadata.get("conversation_length", 0) > 1 for d in feedback_data
-        )
+        return summary.any_interactive
     
     def _prepare_supervised_data(self, feedback_data: List[TrainingData]) -> Dict[str, Any]:
         """Prepare data for supervised fine-tuning."""
         
-        samples = []
-        for data in feedback_data:
-            if data.feedback_score >= 0.7:  # Only use high-quality examples
-                samples.append({
-                    "input": data.query,
-                    "output": data.response,
-                    "quality": data.feedback_score,
-                    "safety": data.safety_score,
-                    "context": data.retrieved_docs
-                })
+        # Only use high-quality examples
+        high_quality = np.flatnonzero(self._feedback_arrays(feedback_data).feedback >= 0.7)
+        samples = [
+            {
+                "input": data.query,
+                "output": data.response,
+                "quality": data.feedback_score,
+                "safety": data.safety_score,
+                "context": data.retrieved_docs
+            }
+            for data in map(feedback_data.__getitem__, high_quality.tolist())
+        ]
         
         return {
             "samples": samples,
@@ -502,16 +653,17 @@ class RAGLearningFramework:
         """Prepare data for Parameter Efficient Fine-Tuning."""
         
         # Similar to supervised but with additional metadata for efficient training
-        samples = []
-        for data in feedback_data:
-            samples.append({
+        samples = [
+            {
                 "input": data.query,
                 "output": data.response,
                 "quality": data.feedback_score,
                 "safety": data.safety_score,
                 "retrieved_docs": data.retrieved_docs,
                 "metadata": data.context_metadata
-            })
+            }
+            for data in feedback_data
+        ]
         
         return {
             "samples": samples,
@@ -546,12 +698,25 @@ class RAGLearningFramework:
     def _prepare_raft_data(self, feedback_data: List[TrainingData]) -> Dict[str, Any]:
         """Prepare data for Retrieval Augmented Fine-Tuning."""
         
+        # Flatten every retrieved doc's relevance into one array for the whole batch
+        docs = [doc for data in feedback_data for doc in data.retrieved_docs]
+        relevance = np.fromiter(
+            (doc.get("relevance", 0) for doc in docs), dtype=np.float64, count=len(docs)
+        )
+        bounds = np.cumsum([len(data.retrieved_docs) for data in feedback_data])[:-1]
+        
+        # Split the global positive/negative doc indices back into per-record groups
+        positive = np.flatnonzero(relevance > 0.7)
+        negative = np.flatnonzero(relevance < 0.3)
+        positive_groups = np.split(positive, np.searchsorted(positive, bounds))
+        negative_groups = np.split(negative, np.searchsorted(negative, bounds))
+        
         samples = []
-        for data in feedback_data:
+        for data, pos_idx, neg_idx in zip(feedback_data, positive_groups, negative_groups):
             samples.append({
                 "query": data.query,
-                "positive_docs": [doc for doc in data.retrieved_docs if doc.get("relevance", 0) > 0.7],
-                "negative_docs": [doc for doc in data.retrieved_docs if doc.get("relevance", 0) < 0.3],
+                "positive_docs": [docs[k] for k in pos_idx.tolist()],
+                "negative_docs": [docs[k] for k in neg_idx.tolist()],
                 "response": data.response,
                 "quality": data.feedback_score
             })
@@ -568,29 +733,33 @@ class RAGLearningFramework:
         # Create preference pairs from feedback data
         preference_pairs = []
         
-        # Group by similar queries
-        query_groups = {}
-        for data in feedback_data:
-            query_key = data.query.lower()[:50]  # Simple grouping
-            if query_key not in query_groups:
-                query_groups[query_key] = []
-            query_groups[query_key].append(data)
+        arrays = self._feedback_arrays(feedback_data)
+        
+        # Group record indices by similar queries
+        query_keys = [data.query.lower()[:50] for data in feedback_data]  # Simple grouping
+        query_groups = defaultdict(list)
+        for i, query_key in enumerate(query_keys):
+            query_groups[query_key].append(i)
         
         # Create preference pairs within groups
-        for query_key, group in query_groups.items():
+        for group in query_groups.values():
             if len(group) >= 2:
-                # Sort by feedback score
-                group.sort(key=lambda x: x.feedback_score, reverse=True)
+                indices = np.array(group)
+                scores = arrays.feedback[indices]
+                # Stable descending sort, then keep adjacent pairs whose gap exceeds 0.5
+                order = indices[np.argsort(-scores, kind="stable")]
+                ranked = arrays.feedback[order]
+                keep = np.flatnonzero(ranked[:-1] > ranked[1:] + 0.5)
                 
-                for i in range(len(group) - 1):
-                    if group[i].feedback_score > group[i + 1].feedback_score + 0.5:
-                        preference_pairs.append({
-                            "query": group[i].query,
-                            "chosen": group[i].response,
-                            "rejected": group[i + 1].response,
-                            "chosen_score": group[i].feedback_score,
-                            "rejected_score": group[i + 1].feedback_score
-                        })
+                for i, j in zip(order[keep].tolist(), order[keep + 1].tolist()):
+                    chosen, rejected = feedback_data[i], feedback_data[j]
+                    preference_pairs.append({
+                        "query": chosen.query,
+                        "chosen": chosen.response,
+                        "rejected": rejected.response,
+                        "chosen_score": chosen.feedback_score,
+                        "rejected_score": rejected.feedback_score
+                    })
         
         return {
             "preference_pairs": preference_pairs,
@@ -604,21 +773,27 @@ class RAGLearningFramework:
         # Focus on safety and ethical considerations
         constitutional_samples = []
         
-        for data in feedback_data:
-            if data.safety_score < 0.9 or "safety" in str(data.improvement_suggestions).lower():
-                constitutional_samples.append({
-                    "query": data.query,
-                    "response": data.response,
-                    "safety_issues": data.improvement_suggestions,
-                    "safety_score": data.safety_score,
-                    "constitutional_principles": [
-                        "Be helpful and harmless",
-                        "Provide accurate mental health information",
-                        "Encourage professional help when appropriate",
-                        "Avoid giving medical diagnoses",
-                        "Be empathetic and supportive"
-                    ]
-                })
+        # Low safety score, or a suggestion mentioning safety on the remaining records
+        flagged = self._feedback_arrays(feedback_data).safety < 0.9
+        for i in np.flatnonzero(~flagged).tolist():
+            if any("safety" in s.lower() for s in feedback_data[i].improvement_suggestions):
+                flagged[i] = True
+        
+        for i in np.flatnonzero(flagged).tolist():
+            data = feedback_data[i]
+            constitutional_samples.append({
+                "query": data.query,
+                "response": data.response,
+                "safety_issues": data.improvement_suggestions,
+                "safety_score": data.safety_score,
+                "constitutional_principles": [
+                    "Be helpful and harmless",
+                    "Provide accurate mental health information",
+                    "Encourage professional help when appropriate",
+                    "Avoid giving medical diagnoses",
+                    "Be empathetic and supportive"
+                ]
+            })
         
         return {
             "samples": constitutional_samples,
@@ -630,17 +805,23 @@ class RAGLearningFramework:
 # Learning method implementations (simplified interfaces)
 
 class LearningMethodBase:
-    """Base class for learning method implementations."""
+    """
+    Base class for learning method implementations.
+    
+    Methods are coroutines so long-running work can be awaited without
+    blocking the event loop; implementations should offload CPU-bound
+    training steps with asyncio.to_thread.
+    """
     
-    def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
+    async def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
         """Train a model with the given configuration and data."""
         raise NotImplementedError
     
-    def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
+    async def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
         """Evaluate a trained model."""
         raise NotImplementedError
     
-    def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    async def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         """Deploy a trained model."""
         raise NotImplementedError
 
@@ -648,7 +829,7 @@ class LearningMethodBase:
 class SupervisedFineTuning(LearningMethodBase):
     """Supervised fine-tuning implementation."""
     
-    def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
+    async def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
         logger.info("Starting supervised fine-tuning")
         
         # In production, this would use transformers library
@@ -663,7 +844,7 @@ class SupervisedFineTuning(LearningMethodBase):
             "training_time_minutes": 45
         }
     
-    def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
+    async def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
         return {
             "accuracy": 0.85,
             "relevance_score": 0.82,
@@ -671,7 +852,7 @@ class SupervisedFineTuning(LearningMethodBase):
             "user_satisfaction": 0.78
         }
     
-    def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    async def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         return {
             "model_path": str(experiment_dir / "model"),
             "deployment_status": "success",
@@ -682,7 +863,7 @@ class SupervisedFineTuning(LearningMethodBase):
 class ParameterEfficientFineTuning(LearningMethodBase):
     """Parameter Efficient Fine-Tuning (LoRA) implementation."""
     
-    def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
+    async def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
         logger.info("Starting PEFT training with LoRA")
         
         return {
@@ -696,7 +877,7 @@ class ParameterEfficientFineTuning(LearningMethodBase):
             "training_time_minutes": 20
         }
     
-    def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
+    async def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
         return {
             "accuracy": 0.83,
             "relevance_score": 0.80,
@@ -705,7 +886,7 @@ class ParameterEfficientFineTuning(LearningMethodBase):
             "efficiency_gain": 0.90
         }
     
-    def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    async def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         return {
             "model_path": str(experiment_dir / "lora_model"),
             "deployment_status": "success",
@@ -717,7 +898,7 @@ class ParameterEfficientFineTuning(LearningMethodBase):
 class ReinforcementLearning(LearningMethodBase):
     """Reinforcement Learning implementation."""
     
-    def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
+    async def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
         logger.info("Starting reinforcement learning training")
         
         return {
@@ -730,7 +911,7 @@ class ReinforcementLearning(LearningMethodBase):
             "training_time_minutes": 120
         }
     
-    def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
+    async def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
         return {
             "average_reward": 0.78,
             "safety_score": 0.92,
@@ -738,7 +919,7 @@ class ReinforcementLearning(LearningMethodBase):
             "response_diversity": 0.85
         }
     
-    def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    async def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         return {
             "model_path": str(experiment_dir / "rl_model"),
             "deployment_status": "success",
@@ -749,7 +930,7 @@ class ReinforcementLearning(LearningMethodBase):
 class RetrievalAugmentedFineTuning(LearningMethodBase):
     """Retrieval Augmented Fine-Tuning implementation."""
     
-    def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
+    async def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
         logger.info("Starting RAFT training")
         
         return {
@@ -761,7 +942,7 @@ class RetrievalAugmentedFineTuning(LearningMethodBase):
             "training_time_minutes": 60
         }
     
-    def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
+    async def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
         return {
             "retrieval_accuracy": 0.90,
             "relevance_score": 0.87,
@@ -769,7 +950,7 @@ class RetrievalAugmentedFineTuning(LearningMethodBase):
             "user_satisfaction": 0.84
         }
     
-    def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    async def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         return {
             "model_path": str(experiment_dir / "raft_model"),
             "deployment_status": "success",
@@ -780,7 +961,7 @@ class RetrievalAugmentedFineTuning(LearningMethodBase):
 class DirectPreferenceOptimization(LearningMethodBase):
     """Direct Preference Optimization implementation."""
     
-    def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
+    async def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
         logger.info("Starting DPO training")
         
         return {
@@ -792,7 +973,7 @@ class DirectPreferenceOptimization(LearningMethodBase):
             "training_time_minutes": 40
         }
     
-    def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
+    async def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
         return {
             "preference_accuracy": 0.87,
             "user_satisfaction": 0.86,
@@ -800,7 +981,7 @@ class DirectPreferenceOptimization(LearningMethodBase):
             "alignment_score": 0.88
         }
     
-    def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    async def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         return {
             "model_path": str(experiment_dir / "dpo_model"),
             "deployment_status": "success",
@@ -811,7 +992,7 @@ class DirectPreferenceOptimization(LearningMethodBase):
 class ConstitutionalAI(LearningMethodBase):
     """Constitutional AI implementation."""
     
-    def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
+    async def train(self, config: LearningConfig, data: Dict[str, Any], experiment_dir: Path) -> Dict[str, Any]:
         logger.info("Starting Constitutional AI training")
         
         return {
@@ -823,7 +1004,7 @@ class ConstitutionalAI(LearningMethodBase):
             "training_time_minutes": 80
         }
     
-    def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
+    async def evaluate(self, experiment_dir: Path, test_data: List[TrainingData]) -> Dict[str, float]:
         return {
             "safety_score": 0.97,
             "helpfulness_score": 0.85,
@@ -832,7 +1013,7 @@ class ConstitutionalAI(LearningMethodBase):
             "user_satisfaction": 0.82
         }
     
-    def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    async def deploy(self, experiment_dir: Path, deployment_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         return {
             "model_path": str(experiment_dir / "constitutional_model"),
             "deployment_status": "success",
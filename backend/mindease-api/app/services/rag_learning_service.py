@@ -6,18 +6,199 @@ of the RAG system using various machine learning approaches.
 """
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+import math
+import re
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+import numpy as np
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, desc, and_
 
 from app.db.models.rag_feedback import RAGFeedback, FeedbackTrainingData
 from app.services.rag_learning_framework import (
-    RAGLearningFramework, LearningMethod, LearningConfig, TrainingData
+    RAGLearningFramework, LearningMethod, LearningMethodName, LearningConfig, TrainingData
 )
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round-trip when streaming feedback for training data
+_TRAINING_FETCH_BATCH_SIZE = 500
+
+# Test samples drawn from recent feedback when evaluating an experiment
+_EVALUATION_SAMPLE_SIZE = 500
+
+# Largest quality-score contribution from everything except overall_rating
+# (detailed ratings 0.3, text 0.2, suggestion 0.1)
+_MAX_QUALITY_BONUS = 0.6
+
+# Quality label for each overall rating 0-5
+_QUALITY_LABELS = ("low", "low", "low", "medium", "high", "high")
+
+# Feedback columns read while scoring and converting training rows. The
+# retrieved_documents JSON is fetched separately, only for qualifying rows.
+_TRAINING_COLUMNS = (
+    RAGFeedback.user_query, RAGFeedback.rag_response,
+    RAGFeedback.relevance_score, RAGFeedback.helpfulness_score,
+    RAGFeedback.accuracy_score, RAGFeedback.clarity_score,
+    RAGFeedback.overall_rating, RAGFeedback.is_safe,
+    RAGFeedback.feedback_text, RAGFeedback.feedback_category,
+    RAGFeedback.suggested_improvement, RAGFeedback.missing_information,
+    RAGFeedback.query_intent, RAGFeedback.user_emotional_state,
+    RAGFeedback.conversation_id, RAGFeedback.session_context
+)
+
+# Free-text feedback mentioning any of these is kept as a suggestion; matched
+# case-insensitively against the raw text so no lowercased copy is built
+_SUGGESTION_KEYWORDS = ("suggest",)
+_SUGGESTION_RE = re.compile("|".join(map(re.escape, _SUGGESTION_KEYWORDS)), re.IGNORECASE)
+
+# Recommendation rules as (category, predicate, payload). Predicates take the
+# readiness assessment and current performance; payloads are shared, so
+# callers must treat them as read-only.
+_RECOMMENDATION_RULES = (
+    (
+        "data_collection",
+        lambda readiness, performance: readiness["data_metrics"]["total_samples"] < 500,
+        {
+            "priority": "high",
+            "action": "increase_feedback_collection",
+            "description": "Implement more feedback collection points in the user interface",
+            "target": "500+ feedback samples"
+        }
+    ),
+    (
+        "data_collection",
+        lambda readiness, performance: readiness["data_metrics"]["feedback_detail_ratio"] < 0.5,
+        {
+            "priority": "medium",
+            "action": "encourage_detailed_feedback",
+            "description": "Add incentives for users to provide detailed feedback",
+            "target": "50%+ detailed feedback rate"
+        }
+    ),
+    (
+        "immediate_actions",
+        lambda readiness, performance: readiness["data_metrics"]["safety_concern_ratio"] > 0.05,
+        {
+            "priority": "critical",
+            "action": "implement_constitutional_ai",
+            "description": "Address safety concerns with Constitutional AI training",
+            "timeline": "immediate"
+        }
+    ),
+    (
+        "immediate_actions",
+        lambda readiness, performance: performance.get("user_satisfaction", 0) < 0.8,
+        {
+            "priority": "high",
+            "action": "improve_response_quality",
+            "description": "Focus on relevance and helpfulness improvements",
+            "timeline": "1-2 weeks"
+        }
+    )
+)
+
+_LONG_TERM_GOALS = (
+    {
+        "goal": "achieve_90_percent_safety",
+        "description": "Maintain 90%+ safety score across all responses",
+        "timeline": "3 months"
+    },
+    {
+        "goal": "achieve_85_percent_satisfaction",
+        "description": "Achieve 85%+ user satisfaction rating",
+        "timeline": "6 months"
+    },
+    {
+        "goal": "implement_continuous_learning",
+        "description": "Establish automated continuous learning pipeline",
+        "timeline": "6 months"
+    }
+)
+
+# Improvement suggestions for a readiness status that blocks training
+_STATUS_IMPROVEMENTS = {
+    "insufficient_data": (
+        "Implement more feedback collection points",
+        "Add feedback prompts after each interaction",
+        "Consider incentivizing user feedback"
+    ),
+    "safety_concerns": (
+        "Review and address safety issues immediately",
+        "Implement additional safety filters",
+        "Consider Constitutional AI training"
+    ),
+    "low_quality_data": (
+        "Improve feedback collection quality",
+        "Add more detailed rating dimensions",
+        "Provide feedback examples to users"
+    )
+}
+
+# Improvement suggestions as (predicate, suggestions); predicates take
+# (quality_ratio, safety_concern_ratio, feedback_detail_ratio)
+_METRIC_IMPROVEMENTS = (
+    (
+        lambda quality, safety, detail: quality < 0.7,
+        ("Focus on improving response quality", "Review low-rated responses for patterns")
+    ),
+    (
+        lambda quality, safety, detail: safety > 0.05,
+        ("Implement stricter safety validation", "Add crisis detection mechanisms")
+    ),
+    (
+        lambda quality, safety, detail: detail < 0.5,
+        ("Encourage more detailed user feedback", "Add guided feedback forms")
+    )
+)
+
+# Readiness assessments keyed by (organization_id, min_samples). The metrics
+# move on the order of minutes, so dashboards polling recommendations can
+# reuse a recent result instead of re-running the 30-day aggregate. Each entry
+# records the end of its window and only serves requests whose window ends
+# within the TTL of it; assessments of past windows are never stored.
+_READINESS_CACHE_MAXSIZE = 64
+_READINESS_CACHE_TTL_SECONDS = 60
+_readiness_cache: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _readiness_cache_get(key: Tuple, window_end: datetime) -> Optional[Dict[str, Any]]:
+    """Return a cached assessment for a window ending near window_end, if fresh."""
+    entry = _readiness_cache.get(key)
+    if entry is None:
+        return None
+    
+    stored_at, cached_window_end, assessment = entry
+    if time.monotonic() - stored_at > _READINESS_CACHE_TTL_SECONDS:
+        del _readiness_cache[key]
+        return None
+    
+    if abs((window_end - cached_window_end).total_seconds()) > _READINESS_CACHE_TTL_SECONDS:
+        return None
+    
+    _readiness_cache.move_to_end(key)
+    return assessment
+
+
+def _readiness_cache_set(key: Tuple, window_end: datetime, assessment: Dict[str, Any]) -> None:
+    """Store a current assessment, evicting the least recently used entry."""
+    if abs((datetime.utcnow() - window_end).total_seconds()) > _READINESS_CACHE_TTL_SECONDS:
+        return
+    
+    _readiness_cache[key] = (time.monotonic(), window_end, assessment)
+    _readiness_cache.move_to_end(key)
+    while len(_readiness_cache) > _READINESS_CACHE_MAXSIZE:
+        _readiness_cache.popitem(last=False)
+
+
+def _readiness_cache_invalidate(organization_id: Optional[str]) -> None:
+    """Drop cached readiness assessments for an organization."""
+    for key in [k for k in _readiness_cache if k[0] == organization_id]:
+        del _readiness_cache[key]
+
 
 class RAGLearningService:
     """
@@ -37,30 +218,46 @@ class RAGLearningService:
     async def assess_learning_readiness(
         self,
         organization_id: Optional[str] = None,
-        min_samples: int = 100
+        min_samples: int = 100,
+        as_of: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Assess whether the system has enough quality data for learning.
         
+        Args:
+            organization_id: Filter by organization
+            min_samples: Samples needed before learning can start
+            as_of: End of the 30-day window, defaulting to now
+            
         Returns:
             Assessment of data readiness and recommended learning approach
         """
         
-        # Get recent feedback data
-        query = self.db.query(RAGFeedback)\
-            .filter(RAGFeedback.created_at >= datetime.utcnow() - timedelta(days=30))
+        window_end = as_of or datetime.utcnow()
+        cache_key = (organization_id, min_samples)
+        cached = _readiness_cache_get(cache_key, window_end)
+        if cached is not None:
+            return cached
+        
+        cutoff = window_end - timedelta(days=30)
+        
+        # Count recent feedback by quality, safety and detail in one aggregate
+        query = self.db.query(
+            func.count(RAGFeedback.id),
+            func.count(RAGFeedback.id).filter(RAGFeedback.overall_rating >= 4),
+            func.count(RAGFeedback.id).filter(RAGFeedback.is_safe.is_(False)),
+            func.count(RAGFeedback.id).filter(
+                and_(RAGFeedback.feedback_text.isnot(None), RAGFeedback.feedback_text != "")
+            )
+        ).select_from(RAGFeedback)\
+            .filter(RAGFeedback.created_at >= cutoff)
         
         if organization_id:
             from app.db.models.auth import User
             query = query.join(User).filter(User.organization_id == organization_id)
         
-        feedback_records = query.all()
-        
         # Analyze data quality and quantity
-        total_samples = len(feedback_records)
-        quality_samples = len([f for f in feedback_records if f.overall_rating and f.overall_rating >= 4])
-        safety_issues = len([f for f in feedback_records if f.is_safe is False])
-        detailed_feedback = len([f for f in feedback_records if f.feedback_text])
+        total_samples, quality_samples, safety_issues, detailed_feedback = query.one()
         
         # Calculate readiness metrics
         data_sufficiency = min(total_samples / min_samples, 1.0)
@@ -95,10 +292,10 @@ class RAGLearningService:
         else:
             recommended_method = None
         
-        return {
+        assessment = {
             "readiness_status": readiness_status,
             "recommended_action": recommended_action,
-            "recommended_method": recommended_method.value if recommended_method else None,
+            "recommended_method": recommended_method,
             "data_metrics": {
                 "total_samples": total_samples,
                 "quality_samples": quality_samples,
@@ -113,51 +310,90 @@ class RAGLearningService:
                 readiness_status, quality_ratio, safety_concern_ratio, feedback_detail_ratio
             )
         }
+        
+        _readiness_cache_set(cache_key, window_end, assessment)
+        return assessment
     
     async def prepare_training_data(
         self,
         organization_id: Optional[str] = None,
         days: int = 30,
-        min_quality_score: float = 0.7
+        min_quality_score: float = 0.7,
+        limit: Optional[int] = None,
+        as_of: Optional[datetime] = None
     ) -> List[TrainingData]:
         """
         Prepare training data from user feedback.
         
+        Feedback rows are streamed from the database in batches, and ratings
+        too low to reach min_quality_score are excluded in SQL.
+        
         Args:
             organization_id: Filter by organization
             days: Number of days of feedback to include
             min_quality_score: Minimum quality threshold for inclusion
+            limit: Return at most this many samples, drawn in random order
+            as_of: End of the feedback window, defaulting to now
             
         Returns:
             List of TrainingData objects ready for ML training
         """
         
-        start_date = datetime.utcnow() - timedelta(days=days)
+        start_date = (as_of or datetime.utcnow()) - timedelta(days=days)
         
         # Get feedback with sufficient quality
         query = self.db.query(RAGFeedback)\
+            .options(load_only(*_TRAINING_COLUMNS))\
             .filter(
                 RAGFeedback.created_at >= start_date,
                 RAGFeedback.overall_rating.isnot(None)
             )
         
+        # Detailed ratings, text and suggestions add at most 0.6 to the quality
+        # score, so lower overall ratings can never qualify
+        min_rating = math.ceil((min_quality_score - _MAX_QUALITY_BONUS) / 0.08 - 1e-6)
+        if min_rating > 1:
+            query = query.filter(RAGFeedback.overall_rating >= min_rating)
+        
         if organization_id:
             from app.db.models.auth import User
             query = query.join(User).filter(User.organization_id == organization_id)
         
-        feedback_records = query.all()
+        # Sample in random order and stop reading once enough rows qualify
+        if limit is not None:
+            query = query.order_by(func.random())
         
-        # Convert to TrainingData format
+        # Convert to TrainingData format, scoring each fetched batch at once
         training_data = []
-        for feedback in feedback_records:
-            # Calculate quality score
-            quality_score = self._calculate_quality_score(feedback)
+        scanned = 0
+        rows = iter(query.yield_per(_TRAINING_FETCH_BATCH_SIZE))
+        while True:
+            batch = list(islice(rows, _TRAINING_FETCH_BATCH_SIZE))
+            if not batch:
+                break
+            scanned += len(batch)
+            
+            quality_scores = self._calculate_quality_scores(batch)
+            
+            selected = np.flatnonzero(quality_scores >= min_quality_score)
+            if limit is not None:
+                selected = selected[:limit - len(training_data)]
             
-            if quality_score >= min_quality_score:
+            if not len(selected):
+                continue
+            
+            survivors = [batch[i] for i in selected.tolist()]
+            retrieved_docs = dict(
+                self.db.query(RAGFeedback.id, RAGFeedback.retrieved_documents)
+                .filter(RAGFeedback.id.in_([f.id for f in survivors]))
+                .all()
+            )
+            
+            for feedback in survivors:
                 training_data.append(TrainingData(
                     query=feedback.user_query,
                     response=feedback.rag_response,
-                    retrieved_docs=feedback.retrieved_documents or [],
+                    retrieved_docs=retrieved_docs.get(feedback.id) or [],
                     feedback_score=feedback.overall_rating / 5.0,  # Normalize to 0-1
                     safety_score=1.0 if feedback.is_safe is True else 0.5 if feedback.is_safe is None else 0.0,
                     relevance_score=feedback.relevance_score / 5.0 if feedback.relevance_score else 0.5,
@@ -171,14 +407,17 @@ class RAGLearningService:
                         "session_context": feedback.session_context or {}
                     }
                 ))
+            
+            if limit is not None and len(training_data) >= limit:
+                break
         
-        logger.info(f"Prepared {len(training_data)} training samples from {len(feedback_records)} feedback records")
+        logger.info(f"Prepared {len(training_data)} training samples from {scanned} feedback records")
         return training_data
     
     async def start_learning_experiment(
         self,
         organization_id: Optional[str] = None,
-        method: Optional[LearningMethod] = None,
+        method: Optional[LearningMethodName] = None,
         config: Optional[LearningConfig] = None
     ) -> str:
         """
@@ -193,21 +432,24 @@ class RAGLearningService:
             experiment_id: Unique identifier for the experiment
         """
         
+        # Read every feedback window relative to the same instant
+        as_of = datetime.utcnow()
+        
         # Assess readiness
-        readiness = await self.assess_learning_readiness(organization_id)
+        readiness = await self.assess_learning_readiness(organization_id, as_of=as_of)
         
         if readiness["readiness_status"] != "ready":
             raise ValueError(f"System not ready for learning: {readiness['readiness_status']}")
         
         # Prepare training data
-        training_data = await self.prepare_training_data(organization_id)
+        training_data = await self.prepare_training_data(organization_id, as_of=as_of)
         
         if len(training_data) < 50:
             raise ValueError(f"Insufficient training data: {len(training_data)} samples")
         
         # Select learning method if not specified
         if method is None:
-            current_performance = await self._get_current_performance(organization_id)
+            current_performance = await self._get_current_performance(organization_id, as_of)
             improvement_goals = {"overall_satisfaction": 0.85, "safety_score": 0.95}
             
             method, auto_config = self.learning_framework.select_learning_method(
@@ -221,18 +463,21 @@ class RAGLearningService:
         prepared_data = self.learning_framework.prepare_training_data(training_data, method)
         
         # Start training
-        experiment_id = self.learning_framework.start_training(method, config, prepared_data)
+        experiment_id = await self.learning_framework.start_training(method, config, prepared_data)
         
         # Store experiment metadata in database
         await self._store_experiment_metadata(experiment_id, method, config, organization_id)
         
-        logger.info(f"Started learning experiment {experiment_id} with method {method.value}")
+        # The next readiness check should reflect the data this experiment consumed
+        _readiness_cache_invalidate(organization_id)
+        
+        logger.info(f"Started learning experiment {experiment_id} with method {method}")
         return experiment_id
     
     async def get_experiment_status(self, experiment_id: str) -> Dict[str, Any]:
         """Get the status of a learning experiment."""
         
-        status = self.learning_framework.get_experiment_status(experiment_id)
+        status = await self.learning_framework.get_experiment_status(experiment_id)
         
         # Add database metadata if available
         db_metadata = await self._get_experiment_metadata(experiment_id)
@@ -261,14 +506,15 @@ class RAGLearningService:
         test_data = await self.prepare_training_data(
             organization_id=organization_id,
             days=7,  # Use recent data for testing
-            min_quality_score=0.5  # Lower threshold for test data
+            min_quality_score=0.5,  # Lower threshold for test data
+            limit=_EVALUATION_SAMPLE_SIZE
         )
         
         if len(test_data) < 10:
             raise ValueError("Insufficient test data for evaluation")
         
         # Evaluate the model
-        evaluation_results = self.learning_framework.evaluate_model(experiment_id, test_data)
+        evaluation_results = await self.learning_framework.evaluate_model(experiment_id, test_data)
         
         # Store evaluation results
         await self._store_evaluation_results(experiment_id, evaluation_results)
@@ -304,7 +550,7 @@ class RAGLearningService:
             raise ValueError("Model does not meet safety requirements for deployment")
         
         # Deploy the model
-        model_path = self.learning_framework.deploy_model(experiment_id, deployment_config)
+        model_path = await self.learning_framework.deploy_model(experiment_id, deployment_config)
         
         # Update deployment status in database
         await self._update_deployment_status(experiment_id, model_path)
@@ -328,11 +574,13 @@ class RAGLearningService:
             List of experiment summaries
         """
         
-        experiments = self.learning_framework.list_experiments()
+        experiments = await self.learning_framework.list_experiments()
         
         # Add database metadata
-        for experiment in experiments:
-            db_metadata = await self._get_experiment_metadata(experiment["experiment_id"])
+        metadata = await asyncio.gather(
+            *(self._get_experiment_metadata(experiment["experiment_id"]) for experiment in experiments)
+        )
+        for experiment, db_metadata in zip(experiments, metadata):
             if db_metadata:
                 experiment["database_metadata"] = db_metadata
         
@@ -359,9 +607,11 @@ class RAGLearningService:
             Recommendations for data collection, learning methods, and improvements
         """
         
-        # Assess current state
-        readiness = await self.assess_learning_readiness(organization_id)
-        current_performance = await self._get_current_performance(organization_id)
+        # Assess current state; the readiness and performance queries share one
+        # reference time so their windows line up
+        as_of = datetime.utcnow()
+        readiness = await self.assess_learning_readiness(organization_id, as_of=as_of)
+        current_performance = await self._get_current_performance(organization_id, as_of)
         recent_experiments = await self.list_experiments(organization_id)
         
         # Generate recommendations
@@ -372,22 +622,9 @@ class RAGLearningService:
             "long_term_goals": []
         }
         
-        # Data collection recommendations
-        if readiness["data_metrics"]["total_samples"] < 500:
-            recommendations["data_collection"].append({
-                "priority": "high",
-                "action": "increase_feedback_collection",
-                "description": "Implement more feedback collection points in the user interface",
-                "target": "500+ feedback samples"
-            })
-        
-        if readiness["data_metrics"]["feedback_detail_ratio"] < 0.5:
-            recommendations["data_collection"].append({
-                "priority": "medium",
-                "action": "encourage_detailed_feedback",
-                "description": "Add incentives for users to provide detailed feedback",
-                "target": "50%+ detailed feedback rate"
-            })
+        for category, predicate, payload in _RECOMMENDATION_RULES:
+            if predicate(readiness, current_performance):
+                recommendations[category].append(payload)
         
         # Learning method recommendations
         if readiness["readiness_status"] == "ready":
@@ -398,42 +635,8 @@ class RAGLearningService:
                 "expected_improvement": "10-15% in user satisfaction"
             })
         
-        # Safety-focused recommendations
-        if readiness["data_metrics"]["safety_concern_ratio"] > 0.05:
-            recommendations["immediate_actions"].append({
-                "priority": "critical",
-                "action": "implement_constitutional_ai",
-                "description": "Address safety concerns with Constitutional AI training",
-                "timeline": "immediate"
-            })
-        
-        # Performance improvement recommendations
-        if current_performance.get("user_satisfaction", 0) < 0.8:
-            recommendations["immediate_actions"].append({
-                "priority": "high",
-                "action": "improve_response_quality",
-                "description": "Focus on relevance and helpfulness improvements",
-                "timeline": "1-2 weeks"
-            })
-        
         # Long-term goals
-        recommendations["long_term_goals"] = [
-            {
-                "goal": "achieve_90_percent_safety",
-                "description": "Maintain 90%+ safety score across all responses",
-                "timeline": "3 months"
-            },
-            {
-                "goal": "achieve_85_percent_satisfaction",
-                "description": "Achieve 85%+ user satisfaction rating",
-                "timeline": "6 months"
-            },
-            {
-                "goal": "implement_continuous_learning",
-                "description": "Establish automated continuous learning pipeline",
-                "timeline": "6 months"
-            }
-        ]
+        recommendations["long_term_goals"] = list(_LONG_TERM_GOALS)
         
         return {
             "current_status": readiness,
@@ -445,45 +648,46 @@ class RAGLearningService:
     
     # Helper methods
     
-    def _calculate_quality_score(self, feedback: RAGFeedback) -> float:
-        """Calculate a quality score for feedback data."""
+    def _calculate_quality_scores(self, feedback_batch: List[RAGFeedback]) -> np.ndarray:
+        """Calculate quality scores for a batch of feedback records."""
         
-        score = 0.0
+        n = len(feedback_batch)
         
         # Base score from overall rating
-        if feedback.overall_rating:
-            score += feedback.overall_rating / 5.0 * 0.4
-        
-        # Bonus for detailed ratings
-        detailed_scores = [
-            feedback.relevance_score,
-            feedback.helpfulness_score,
-            feedback.accuracy_score,
-            feedback.clarity_score
-        ]
-        
-        valid_scores = [s for s in detailed_scores if s is not None]
-        if valid_scores:
-            score += (sum(valid_scores) / len(valid_scores) / 5.0) * 0.3
+        ratings = np.fromiter(
+            (f.overall_rating or 0 for f in feedback_batch), dtype=np.float64, count=n
+        )
+        scores = ratings / 5.0 * 0.4
+        
+        # Bonus for detailed ratings, averaged over the ones provided
+        detailed = np.array(
+            [
+                [f.relevance_score, f.helpfulness_score, f.accuracy_score, f.clarity_score]
+                for f in feedback_batch
+            ],
+            dtype=np.float64
+        ).reshape(n, 4)
+        provided = ~np.isnan(detailed)
+        counts = provided.sum(axis=1)
+        totals = np.where(provided, detailed, 0.0).sum(axis=1)
+        scores += np.where(counts > 0, totals / np.maximum(counts, 1) / 5.0 * 0.3, 0.0)
         
         # Bonus for text feedback
-        if feedback.feedback_text and len(feedback.feedback_text.strip()) > 10:
-            score += 0.2
+        scores += np.fromiter(
+            (bool(f.feedback_text and len(f.feedback_text.strip()) > 10) for f in feedback_batch),
+            dtype=bool, count=n
+        ) * 0.2
         
         # Bonus for suggestions
-        if feedback.suggested_improvement:
-            score += 0.1
+        scores += np.fromiter(
+            (bool(f.suggested_improvement) for f in feedback_batch), dtype=bool, count=n
+        ) * 0.1
         
-        return min(score, 1.0)
+        return np.minimum(scores, 1.0)
     
     def _get_quality_label(self, rating: int) -> str:
         """Convert rating to quality label."""
-        if rating >= 4:
-            return "high"
-        elif rating >= 3:
-            return "medium"
-        else:
-            return "low"
+        return _QUALITY_LABELS[min(max(rating, 0), 5)]
     
     def _extract_suggestions(self, feedback: RAGFeedback) -> List[str]:
         """Extract improvement suggestions from feedback."""
@@ -495,35 +699,39 @@ class RAGLearningService:
         if feedback.missing_information:
             suggestions.append(f"Missing: {feedback.missing_information}")
         
-        if feedback.feedback_text and "suggest" in feedback.feedback_text.lower():
+        if feedback.feedback_text and _SUGGESTION_RE.search(feedback.feedback_text):
             suggestions.append(feedback.feedback_text)
         
         return suggestions
     
-    async def _get_current_performance(self, organization_id: Optional[str]) -> Dict[str, float]:
+    async def _get_current_performance(
+        self,
+        organization_id: Optional[str],
+        as_of: Optional[datetime] = None
+    ) -> Dict[str, float]:
         """Get current system performance metrics."""
         
         # Get recent feedback for performance calculation
-        recent_date = datetime.utcnow() - timedelta(days=7)
-        
-        query = self.db.query(RAGFeedback)\
+        recent_date = (as_of or datetime.utcnow()) - timedelta(days=7)
+        
+        # Sum and count ratings and safety flags in SQL; integer aggregates keep
+        # the averages below identical to summing the rows in Python
+        query = self.db.query(
+            func.sum(RAGFeedback.overall_rating),
+            func.count(RAGFeedback.overall_rating),
+            func.count(RAGFeedback.id).filter(RAGFeedback.is_safe.is_(True)),
+            func.count(RAGFeedback.is_safe)
+        ).select_from(RAGFeedback)\
             .filter(RAGFeedback.created_at >= recent_date)
         
         if organization_id:
             from app.db.models.auth import User
             query = query.join(User).filter(User.organization_id == organization_id)
         
-        recent_feedback = query.all()
-        
-        if not recent_feedback:
-            return {"user_satisfaction": 0.5, "safety_score": 0.9, "response_quality": 0.5}
+        rating_sum, rating_count, safe_count, safety_count = query.one()
         
-        # Calculate metrics
-        ratings = [f.overall_rating for f in recent_feedback if f.overall_rating]
-        safety_scores = [1.0 if f.is_safe is True else 0.0 for f in recent_feedback if f.is_safe is not None]
-        
-        user_satisfaction = sum(ratings) / len(ratings) / 5.0 if ratings else 0.5
-        safety_score = sum(safety_scores) / len(safety_scores) if safety_scores else 0.9
+        user_satisfaction = rating_sum / rating_count / 5.0 if rating_count else 0.5
+        safety_score = safe_count / safety_count if safety_count else 0.9
         response_quality = user_satisfaction  # Simplified
         
         return {
@@ -541,34 +749,11 @@ class RAGLearningService:
     ) -> List[str]:
         """Generate specific improvement recommendations."""
         
-        recommendations = []
-        
-        if readiness_status == "insufficient_data":
-            recommendations.append("Implement more feedback collection points")
-            recommendations.append("Add feedback prompts after each interaction")
-            recommendations.append("Consider incentivizing user feedback")
-        
-        elif readiness_status == "safety_concerns":
-            recommendations.append("Review and address safety issues immediately")
-            recommendations.append("Implement additional safety filters")
-            recommendations.append("Consider Constitutional AI training")
-        
-        elif readiness_status == "low_quality_data":
-            recommendations.append("Improve feedback collection quality")
-            recommendations.append("Add more detailed rating dimensions")
-            recommendations.append("Provide feedback examples to users")
-        
-        if quality_ratio < 0.7:
-            recommendations.append("Focus on improving response quality")
-            recommendations.append("Review low-rated responses for patterns")
-        
-        if safety_concern_ratio > 0.05:
-            recommendations.append("Implement stricter safety validation")
-            recommendations.append("Add crisis detection mechanisms")
+        recommendations = list(_STATUS_IMPROVEMENTS.get(readiness_status, ()))
         
-        if feedback_detail_ratio < 0.5:
-            recommendations.append("Encourage more detailed user feedback")
-            recommendations.append("Add guided feedback forms")
+        for predicate, suggestions in _METRIC_IMPROVEMENTS:
+            if predicate(quality_ratio, safety_concern_ratio, feedback_detail_ratio):
+                recommendations.extend(suggestions)
         
         return recommendations
     
@@ -603,7 +788,7 @@ class RAGLearningService:
     async def _store_experiment_metadata(
         self,
         experiment_id: str,
-        method: LearningMethod,
+        method: LearningMethodName,
         config: LearningConfig,
         organization_id: Optional[str]
     ):
@@ -2,10 +2,14 @@
 Social service for managing social interactions.
 """
 import logging
-from typing import Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy import desc, func
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, desc, func, insert, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
 from app.db.models.social import (
     SocialPost,
@@ -15,8 +19,6 @@ from app.db.models.social import (
     SocialPostTag,
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -32,43 +34,72 @@ class SocialService:
         """
         self.db = db
     
+    @contextmanager
+    def _rollback_on_error(self, action: str) -> Iterator[None]:
+        """
+        Roll back and log any error raised inside the block, then swallow it
+        so the caller falls through to its failure return value.
+        
+        Args:
+            action: What the block does, for the log message
+        """
+        try:
+            yield
+        except Exception as e:
+            self.db.rollback()
+            logger.exception("Error %s: %s", action, e)
+    
     def get_posts(
         self,
         limit: int = 20,
-        offset: int = 0,
+        cursor: Optional[Tuple[datetime, int]] = None,
         user_id: Optional[int] = None,
         tag: Optional[str] = None
     ) -> List[SocialPost]:
         """
-        Get social posts with optional filtering.
+        Get social posts with optional filtering, newest first.
+        
+        Pages are keyset-paginated: pass the (created_at, id) of the last post
+        of the previous page as cursor to get the next one.
         """
         try:
             query = self.db.query(SocialPost)
             
+            if cursor:
+                query = query.filter(
+                    tuple_(SocialPost.created_at, SocialPost.id) < tuple_(*cursor)
+                )
+            
             if user_id:
                 query = query.filter(SocialPost.user_id == user_id)
             
             if tag:
-                # --- Old: join(Tag) ---
-                # query = query.join(Tag).filter(Tag.name == tag)
-                # New: join via the association table SocialPostTag and SocialTag
-                query = (
-                    query
-                    .join(SocialPostTag, SocialPostTag.post_id == SocialPost.id)
-                    .join(SocialTag, SocialTag.id == SocialPostTag.tag_id)
-                    .filter(SocialTag.name == tag)
+                # Filter with a semi-join rather than joining the tag rows in:
+                # contains_eager over such a join would fill post.tags with the
+                # matching tag only, so the full collection comes from the
+                # selectinload below instead
+                # Tag names are stored normalized, as create_post writes them
+                query = query.filter(
+                    SocialPost.tags.any(
+                        SocialPostTag.tag.has(SocialTag.name == tag.strip().lower())
+                    )
                 )
             
+            # Load tags and comments for the whole page with one IN query per
+            # relationship instead of lazy loads per post
             return (
                 query
-                .order_by(desc(SocialPost.created_at))
-                .offset(offset)
+                .options(
+                    selectinload(SocialPost.tags).selectinload(SocialPostTag.tag),
+                    selectinload(SocialPost.comments)
+                )
+                .order_by(desc(SocialPost.created_at), desc(SocialPost.id))
                 .limit(limit)
                 .all()
             )
         
         except Exception as e:
-            logger.error(f"Error getting posts: {e}")
+            logger.exception("Error getting posts: %s", e)
             return []
     
     def create_post(
@@ -80,7 +111,7 @@ class SocialService:
         """
         Create a new social post.
         """
-        try:
+        with self._rollback_on_error("creating post"):
             post = SocialPost(
                 user_id=user_id,
                 content=content
@@ -88,33 +119,36 @@ class SocialService:
             self.db.add(post)
             self.db.flush()  # to assign post.id
             
-            if tags:
-                for tag_name in tags:
-                    # --- Old: Tag(...) ---
-                    # tag = Tag(name=tag_name.lower().strip())
-                    # New: use SocialTag and SocialPostTag
-                    tag_obj = (
-                        self.db.query(SocialTag)
-                              .filter(SocialTag.name == tag_name.lower().strip())
-                              .first()
-                    )
-                    if not tag_obj:
-                        tag_obj = SocialTag(name=tag_name.lower().strip())
-                        self.db.add(tag_obj)
-                        self.db.flush()
-                    assoc = SocialPostTag(
-                        post_id=post.id,
-                        tag_id=tag_obj.id
+            # Normalize once; blank and repeated names ("foo, FOO ") collapse
+            names = list(dict.fromkeys(
+                name for name in (t.strip().lower() for t in tags or ()) if name
+            ))
+            
+            if names:
+                # Resolve every tag in one lookup, insert the missing ones in
+                # one batch, then link them all with a single executemany
+                tag_ids = dict(
+                    self.db.query(SocialTag.name, SocialTag.id)
+                           .filter(SocialTag.name.in_(names))
+                           .all()
+                )
+                missing = [name for name in names if name not in tag_ids]
+                if missing:
+                    tag_ids.update(
+                        (name, tag_id) for tag_id, name in self.db.execute(
+                            insert(SocialTag).returning(SocialTag.id, SocialTag.name),
+                            [{"name": name} for name in missing]
+                        )
                     )
-                    self.db.add(assoc)
+                self.db.execute(
+                    insert(SocialPostTag),
+                    [{"post_id": post.id, "tag_id": tag_ids[name]} for name in names]
+                )
             
             self.db.commit()
             return post
         
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error creating post: {e}")
-            return None
+        return None
     
     def add_comment(
         self,
@@ -125,10 +159,10 @@ class SocialService:
         """
         Add a comment to a post.
         """
-        try:
-            post = self.db.query(SocialPost).get(post_id)
+        with self._rollback_on_error("adding comment"):
+            post = self.db.get(SocialPost, post_id)
             if not post:
-                logger.error(f"Post {post_id} not found")
+                logger.error("Post %s not found", post_id)
                 return None
             
             # --- Old: Comment(...) ---
@@ -142,10 +176,7 @@ class SocialService:
             self.db.commit()
             return comment
         
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error adding comment: {e}")
-            return None
+        return None
     
     def add_like(
         self,
@@ -156,43 +187,40 @@ class SocialService:
         """
         Add a like to a post or comment.
         """
-        try:
-            if post_id:
-                target = self.db.query(SocialPost).get(post_id)
-            else:
-                target = self.db.query(SocialComment).get(comment_id)
-            
-            if not target:
+        if not post_id and not comment_id:
+            logger.error("Target for like not found")
+            return None
+        
+        with self._rollback_on_error("adding like"):
+            # The foreign keys reject a missing post or comment and
+            # uq_like_user_target turns a repeated like into a no-op, so the
+            # insert needs no existence probes
+            try:
+                like = self.db.scalar(
+                    pg_insert(SocialLike)
+                    .values(user_id=user_id, post_id=post_id, comment_id=comment_id)
+                    .on_conflict_do_nothing(constraint="uq_like_user_target")
+                    .returning(SocialLike)
+                )
+            except IntegrityError:
+                self.db.rollback()
                 logger.error("Target for like not found")
                 return None
             
-            # --- Old: Like(...) ---
-            # existing = self.db.query(Like)...
-            existing = (
-                self.db.query(SocialLike)
-                       .filter(
-                           SocialLike.user_id == user_id,
-                           SocialLike.post_id == post_id,
-                           SocialLike.comment_id == comment_id
-                       )
-                       .first()
-            )
-            if existing:
-                return existing
-            
-            like = SocialLike(
-                user_id=user_id,
-                post_id=post_id,
-                comment_id=comment_id
-            )
-            self.db.add(like)
+            if like is None:
+                like = (
+                    self.db.query(SocialLike)
+                           .filter(
+                               SocialLike.user_id == user_id,
+                               SocialLike.post_id == post_id,
+                               SocialLike.comment_id == comment_id
+                           )
+                           .first()
+                )
             self.db.commit()
             return like
         
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error adding like: {e}")
-            return None
+        return None
     
     def remove_like(
         self,
@@ -203,26 +231,19 @@ class SocialService:
         """
         Remove a like from a post or comment.
         """
-        try:
-            like = (
-                self.db.query(SocialLike)
-                       .filter(
-                           SocialLike.user_id == user_id,
-                           SocialLike.post_id == post_id,
-                           SocialLike.comment_id == comment_id
-                       )
-                       .first()
+        with self._rollback_on_error("removing like"):
+            # A single DELETE; rowcount tells whether the like existed
+            result = self.db.execute(
+                delete(SocialLike).where(
+                    SocialLike.user_id == user_id,
+                    SocialLike.post_id == post_id,
+                    SocialLike.comment_id == comment_id
+                )
             )
-            if not like:
-                return False
-            self.db.delete(like)
             self.db.commit()
-            return True
+            return result.rowcount > 0
         
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error removing like: {e}")
-            return False
+        return False
     
     def get_post_with_comments(
         self,
@@ -232,22 +253,17 @@ class SocialService:
         Get a post with its comments.
         """
         try:
-            post = self.db.query(SocialPost).get(post_id)
+            post = self.db.get(
+                SocialPost, post_id, options=[selectinload(SocialPost.comments)]
+            )
             if not post:
                 return None
             
-            # --- Old: Comment(...)---
-            # comments = self.db.query(Comment)...
-            comments = (
-                self.db.query(SocialComment)
-                       .filter(SocialComment.post_id == post_id)
-                       .order_by(SocialComment.created_at)
-                       .all()
-            )
-            return post, comments
+            # The relationship orders comments by created_at in the load query
+            return post, list(post.comments)
         
         except Exception as e:
-            logger.error(f"Error getting post with comments: {e}")
+            logger.exception("Error getting post with comments: %s", e)
             return None
     
     def get_trending_tags(self, limit: int = 10) -> List[Dict]:
@@ -255,12 +271,12 @@ class SocialService:
         Get trending tags.
         """
         try:
-            # --- Old: Tag.name, func.count(Tag.id) ---
-            # tag_counts = self.db.query(Tag.name, ...)
+            # count(*) lets the tag_id index answer the join without reading
+            # any other association column
             tag_counts = (
                 self.db.query(
                     SocialTag.name,
-                    func.count(SocialPostTag.id).label("count")
+                    func.count().label("count")
                 )
                 .join(SocialPostTag, SocialPostTag.tag_id == SocialTag.id)
                 .group_by(SocialTag.name)
@@ -271,5 +287,5 @@ class SocialService:
             return [{"name": name, "count": count} for name, count in tag_counts]
         
         except Exception as e:
-            logger.error(f"Error getting trending tags: {e}")
-            return []
\ No newline at end of file
+            logger.exception("Error getting trending tags: %s", e)
+            return []
@@ -2,17 +2,17 @@
 Therapy service for managing therapy sessions and exercises.
 """
 import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy import desc
+from sqlalchemy import desc, func, select, tuple_
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
 from app.db.models.therapy import TherapyExercise, TherapyProgram, TherapySession
 from app.db.models.auth import User
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -28,24 +28,55 @@ class TherapyService:
         """
         self.db = db
     
-    def get_user_sessions(self, user_id: int, limit: int = 10) -> List[TherapySession]:
+    @contextmanager
+    def _rollback_on_error(self, action: str) -> Iterator[None]:
         """
-        Get therapy sessions for a user.
+        Roll back and log any error raised inside the block, then swallow it
+        so the caller falls through to its failure return value.
+        
+        Args:
+            action: What the block does, for the log message
+        """
+        try:
+            yield
+        except Exception as e:
+            self.db.rollback()
+            logger.exception("Error %s: %s", action, e)
+    
+    def get_user_sessions(
+        self,
+        user_id: int,
+        limit: int = 10,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> List[Row]:
+        """
+        Get therapy sessions for a user, newest first.
         
         Args:
             user_id: User ID
             limit: Maximum number of sessions to return
+            cursor: (created_at, id) of the last session of the previous page
             
         Returns:
-            List of therapy sessions
+            List of therapy session rows (column values only, no relationships)
         """
         try:
-            return self.db.query(TherapySession).filter(
+            stmt = select(*TherapySession.__table__.c).where(
                 TherapySession.user_id == user_id
-            ).order_by(desc(TherapySession.created_at)).limit(limit).all()
+            )
+            if cursor:
+                stmt = stmt.where(
+                    tuple_(TherapySession.created_at, TherapySession.id) < tuple_(*cursor)
+                )
+            
+            return self.db.execute(
+                stmt.order_by(
+                    desc(TherapySession.created_at), desc(TherapySession.id)
+                ).limit(limit)
+            ).all()
         
         except Exception as e:
-            logger.error(f"Error getting user sessions: {str(e)}")
+            logger.exception("Error getting user sessions: %s", e)
             return []
     
     def create_session(
@@ -67,13 +98,11 @@ class TherapyService:
         Returns:
             Created therapy session or None if creation fails
         """
-        try:
+        with self._rollback_on_error("creating therapy session"):
             # Check if exercise exists
-            exercise = self.db.query(TherapyExercise).filter(
-                TherapyExercise.id == exercise_id
-            ).first()
+            exercise = self.db.get(TherapyExercise, exercise_id)
             if not exercise:
-                logger.error(f"Exercise with ID {exercise_id} not found")
+                logger.error("Exercise with ID %s not found", exercise_id)
                 return None
             
             # Create session
@@ -89,23 +118,20 @@ class TherapyService:
             self.db.commit()
             return session
         
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error creating therapy session: {str(e)}")
-            return None
+        return None
     
-    def get_available_exercises(self) -> List[TherapyExercise]:
+    def get_available_exercises(self) -> List[Row]:
         """
         Get all available therapy exercises.
         
         Returns:
-            List of therapy exercises
+            List of therapy exercise rows (column values only, no relationships)
         """
         try:
-            return self.db.query(TherapyExercise).all()
+            return self.db.execute(select(*TherapyExercise.__table__.c)).all()
         
         except Exception as e:
-            logger.error(f"Error getting available exercises: {str(e)}")
+            logger.exception("Error getting available exercises: %s", e)
             return []
     
     def get_user_programs(self, user_id: int) -> List[TherapyProgram]:
@@ -124,7 +150,7 @@ class TherapyService:
             ).order_by(desc(TherapyProgram.created_at)).all()
         
         except Exception as e:
-            logger.error(f"Error getting user programs: {str(e)}")
+            logger.exception("Error getting user programs: %s", e)
             return []
     
     def create_program(
@@ -146,7 +172,11 @@ class TherapyService:
         Returns:
             Created therapy program or None if creation fails
         """
-        try:
+        # NOTE: TherapyProgram has no user_id column or exercises relation
+        # (programs link to users through TherapyProgramEnrollment and carry
+        # TherapyProgramActivity rows), so this method fails on construction
+        # and has no callers; it needs redesigning against that schema.
+        with self._rollback_on_error("creating therapy program"):
             # Create program
             program = TherapyProgram(
                 user_id=user_id,
@@ -168,10 +198,7 @@ class TherapyService:
             self.db.commit()
             return program
         
-        except Exception as e:
-            self.db.rollback()
-            logger.error(f"Error creating therapy program: {str(e)}")
-            return None
+        return None
     
     def get_session_stats(self, user_id: int) -> Dict:
         """
@@ -184,33 +211,25 @@ class TherapyService:
             Dictionary with session statistics
         """
         try:
-            # Get total sessions
-            total_sessions = self.db.query(TherapySession).filter(
-                TherapySession.user_id == user_id
-            ).count()
-            
-            # Get total duration
-            total_duration = self.db.query(
-                func.sum(TherapySession.duration)
-            ).filter(
-                TherapySession.user_id == user_id
-            ).scalar() or 0
-            
-            # Get exercise distribution
-            exercise_counts = {}
-            sessions = self.db.query(
-                TherapySession.exercise_id,
-                func.count(TherapySession.id)
+            # Get total sessions and duration in one aggregate
+            total_sessions, total_duration = self.db.query(
+                func.count(TherapySession.id),
+                func.coalesce(func.sum(TherapySession.duration_seconds), 0)
             ).filter(
                 TherapySession.user_id == user_id
-            ).group_by(TherapySession.exercise_id).all()
+            ).one()
             
-            for exercise_id, count in sessions:
-                exercise = self.db.query(TherapyExercise).filter(
-                    TherapyExercise.id == exercise_id
-                ).first()
-                if exercise:
-                    exercise_counts[exercise.name] = count
+            # Get exercise distribution: sessions per exercise type
+            exercise_counts = dict(
+                self.db.query(
+                    TherapyExercise.exercise_type,
+                    func.count(func.distinct(TherapySession.id))
+                ).join(
+                    TherapySession, TherapyExercise.session_id == TherapySession.id
+                ).filter(
+                    TherapySession.user_id == user_id
+                ).group_by(TherapyExercise.exercise_type).all()
+            )
             
             return {
                 "total_sessions": total_sessions,
@@ -219,7 +238,7 @@ class TherapyService:
             }
         
         except Exception as e:
-            logger.error(f"Error getting session stats: {str(e)}")
+            logger.exception("Error getting session stats: %s", e)
             return {
                 "total_sessions": 0,
                 "total_duration": 0,
@@ -1,57 +1,57 @@
+import asyncio
 import os
+from datetime import timedelta
+import httpx
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import pytest_asyncio
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
+from passlib.hash import bcrypt
 import sys
 sys.path.append(os.path.abspath("."))
 
 # Import from the correct models location
 from app.db.models.base import Base
-from app.core.security import create_access_token, get_password_hash
+from app.core.security import create_access_token
 
-# Use in-memory SQLite for tests
-TEST_DATABASE_URL = "sqlite:///:memory:"
+def _test_database_url(worker):
+    """In-memory SQLite URL private to one pytest-xdist worker."""
+    return f"sqlite:///file:mindease_{worker}?mode=memory&cache=shared&uri=true"
 
-@pytest.fixture(scope="session")
-def db_engine():
-    """Create a test database engine."""
-    engine = create_engine(
-        TEST_DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
-    # Import all models to ensure they're registered
-    try:
-        from app.db.models import auth, document, mood, organization, social, therapy
-        Base.metadata.create_all(bind=engine)
-    except ImportError as e:
-        print(f"Warning: Could not import some models for testing: {e}")
-    
-    yield engine
-    Base.metadata.drop_all(bind=engine)
+# Hashing is deliberately slow, so every test user shares one precomputed
+# hash, made at bcrypt's minimum cost; verify_password accepts any cost
+TEST_PASSWORD = "password123"
+TEST_PASSWORD_HASH = bcrypt.using(rounds=4).hash(TEST_PASSWORD)
 
-@pytest.fixture(scope="function")
-def seeded_db(db_engine):
-    """Create a database session with test data."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
-    session = TestingSessionLocal()
+# Placeholder that model tests put in User.password_hash
+PLACEHOLDER_PASSWORD_HASH = "hashed_password"
+
+def _use_precomputed_hash(mapper, connection, target):
+    """Store the precomputed hash for users inserted with the placeholder."""
+    if target.password_hash == PLACEHOLDER_PASSWORD_HASH:
+        target.password_hash = TEST_PASSWORD_HASH
+
+# Counterparty users seeded once per run; tests pick from the pool instead of
+# inserting their own, and per-test savepoints undo anything done to them
+POOL_USER_EMAILS = tuple(f"pool{i}@example.com" for i in range(10))
+
+def _seed_baseline(engine):
+    """Insert the data every test can rely on, committed once per run."""
+    session = Session(bind=engine)
     
     try:
-        # Create minimal test data
         from app.db.models.auth import User, Role
         
         # Create a test role
         test_role = Role(name="test_user", description="Test user role")
-        session.add(test_role)
-        session.commit()
         
         # Create a test user
         test_user = User(
             username="testuser",
             email="test@example.com",
-            password_hash=get_password_hash("password123"),
+            password_hash=TEST_PASSWORD_HASH,
             is_active=True,
             email_confirmed=True,
             terms_accepted=True
@@ -59,28 +59,253 @@ def seeded_db(db_engine):
         test_user.roles.append(test_role)
         session.add(test_user)
         session.commit()
-        
-        yield session
     except Exception as e:
-        print(f"Warning: Could not create test data: {e}")
-        yield session
-    finally:
         session.rollback()
+        pytest.fail(f"Could not create test data: {e}")
+    finally:
         session.close()
 
+@pytest.fixture(scope="session")
+def db_engine(worker_id):
+    """Create a test database engine with the schema and baseline data.
+    
+    Each xdist worker gets its own database, named after xdist's worker_id
+    ("master" without xdist), so tests from one module can run on several
+    workers at once without seeing each other's rows.
+    """
+    engine = create_engine(
+        _test_database_url(worker_id),
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        query_cache_size=1200,
+    )
+    
+    # pysqlite defers BEGIN and ignores SAVEPOINT semantics; take over
+    # transaction control so the per-test savepoints below really nest
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # Test data is throwaway, so skip journaling and fsync work
+        dbapi_connection.execute("PRAGMA journal_mode=MEMORY")
+        dbapi_connection.execute("PRAGMA synchronous=OFF")
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    # Import all models to ensure they're registered
+    try:
+        from app.db.models import auth, document, mood, organization, social, therapy
+        Base.metadata.create_all(bind=engine)
+        event.listen(auth.User, "before_insert", _use_precomputed_hash)
+    except ImportError as e:
+        pytest.fail(f"Could not import the models for testing: {e}")
+    
+    _seed_baseline(engine)
+    
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    
+    from app.db.models.auth import User
+    if event.contains(User, "before_insert", _use_precomputed_hash):
+        event.remove(User, "before_insert", _use_precomputed_hash)
+
+@pytest.fixture(scope="session")
+def seed_baseline(db_engine):
+    """Insert the pooled counterparty users once and return their emails."""
+    from app.db.models.auth import User
+    
+    with Session(bind=db_engine) as session:
+        session.add_all([
+            User(
+                username=email.split("@")[0],
+                email=email,
+                password_hash=TEST_PASSWORD_HASH,
+                is_active=True
+            )
+            for email in POOL_USER_EMAILS
+        ])
+        session.commit()
+    
+    return POOL_USER_EMAILS
+
+@pytest.fixture(scope="function")
+def connection(db_engine):
+    """Open a connection whose outer transaction is rolled back after the test."""
+    conn = db_engine.connect()
+    transaction = conn.begin()
+    
+    yield conn
+    
+    transaction.rollback()
+    conn.close()
+
+# Statements sql_statements leaves out of its budget
+_TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
 @pytest.fixture(scope="function")
-def client():
-    """Create a test client without database dependency."""
+def sql_statements(connection):
+    """Record every query the test's connection sends.
+    
+    List endpoints can assert a fixed statement budget with it, so a route
+    that lazy-loads a relationship per row fails instead of slipping by.
+    Transaction control (the savepoints db_session opens) is not counted.
+    """
+    statements = []
+    
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(_TRANSACTION_CONTROL):
+            statements.append(statement)
+    
+    event.listen(connection, "before_cursor_execute", _record)
+    yield statements
+    event.remove(connection, "before_cursor_execute", _record)
+
+@pytest.fixture(scope="function")
+def db_session(connection):
+    """Create a database session isolated from other tests.
+    
+    The session joins the connection's outer transaction through a SAVEPOINT,
+    so commits inside a test release only the savepoint and everything the
+    test wrote is discarded when the outer transaction rolls back.
+    """
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    
+    yield session
+    
+    session.close()
+
+@pytest.fixture(scope="function")
+def seeded_db(db_session):
+    """Database session with the baseline test data."""
+    return db_session
+
+@pytest.fixture(scope="session")
+def test_password():
+    """Plain-text password matching test_password_hash."""
+    return TEST_PASSWORD
+
+@pytest.fixture(scope="session")
+def test_password_hash():
+    """Precomputed hash of TEST_PASSWORD for tests that create users."""
+    return TEST_PASSWORD_HASH
+
+def _override_dependency(app, dependency, override):
+    """Install an override and return a callable that restores the previous one."""
+    previous = app.dependency_overrides.get(dependency)
+    app.dependency_overrides[dependency] = override
+    
+    def restore():
+        if previous is None:
+            app.dependency_overrides.pop(dependency, None)
+        else:
+            app.dependency_overrides[dependency] = previous
+    
+    return restore
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI application, imported once per run."""
     from main import app
     
+    return app
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Create a test client without database dependency.
+    
+    One client serves the whole run, so the app's startup hooks run once
+    rather than once per test or module.
+    """
     # Override database dependency to skip DB operations
     def override_get_db():
         return None
     
     from app.db.session import get_db
-    app.dependency_overrides[get_db] = override_get_db
+    restore = _override_dependency(app, get_db, override_get_db)
     
     with TestClient(app) as test_client:
         yield test_client
     
-    app.dependency_overrides.clear()
+    restore()
+
+@pytest.fixture(scope="session")
+def test_user_id(db_engine):
+    """Primary key of the baseline user, stable for the whole run."""
+    from app.db.models.auth import User
+    
+    with Session(bind=db_engine) as session:
+        return session.query(User.id).filter(User.email == "test@example.com").scalar()
+
+@pytest.fixture(scope="session")
+def auth_token(test_user_id):
+    """Access token for the baseline user, signed once per run."""
+    return create_access_token(test_user_id, expires_delta=timedelta(hours=1))
+
+@pytest.fixture(scope="function")
+def test_user(db_session, test_user_id):
+    """The baseline user, loaded into the test's session."""
+    from app.db.models.auth import User
+    
+    return db_session.get(User, test_user_id)
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop shared by every async test in the run."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest_asyncio.fixture(scope="session")
+async def session_client(app, auth_token):
+    """One async client, authenticated as test_user, for the whole run.
+    
+    Requests go straight to the ASGI app on the shared event loop, without
+    the thread and loop TestClient starts for each call, and the token is
+    signed once.
+    """
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    ) as test_client:
+        yield test_client
+
+@pytest.fixture(scope="function")
+def authorized_client(app, db_session, session_client):
+    """The shared authenticated client, bound to this test's session.
+    
+    Routes share the test's savepoint session, so they see rows the test
+    wrote without a real commit and their own writes roll back with it.
+    """
+    from app.db.session import get_db
+    
+    def override_get_db():
+        yield db_session
+    
+    restore = _override_dependency(app, get_db, override_get_db)
+    
+    yield session_client
+    
+    # Nothing a route set on the client may leak into the next test
+    session_client.cookies.clear()
+    restore()
+
+@pytest.fixture(scope="function")
+def user_factory(db_session):
+    """UserFactory bound to the test's savepoint session."""
+    from app.tests.factories import UserFactory, bind_session
+    
+    with bind_session(db_session):
+        yield UserFactory
+
+@pytest.fixture(scope="function")
+def pool_users(db_session, seed_baseline):
+    """The pooled users, loaded into the test's session in pool order."""
+    from app.db.models.auth import User
+    
+    users = {
+        user.email: user
+        for user in db_session.query(User).filter(User.email.in_(seed_baseline))
+    }
+    return [users[email] for email in seed_baseline]
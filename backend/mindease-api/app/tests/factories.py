@@ -0,0 +1,42 @@
+"""
+factory_boy factories for test data.
+
+Factories persist through the session bound with ``bind_session``, which
+tests point at their per-test savepoint session so everything a factory
+creates rolls back with the test.
+"""
+from contextlib import contextmanager
+
+import factory
+from factory.alchemy import SQLAlchemyModelFactory
+
+from app.db.models.auth import User
+
+
+class UserFactory(SQLAlchemyModelFactory):
+    """A persisted, active user."""
+
+    class Meta:
+        model = User
+        sqlalchemy_session_persistence = "commit"
+
+    username = factory.Sequence(lambda n: f"factory_user{n}")
+    email = factory.LazyAttribute(lambda user: f"{user.username}@example.com")
+    # Swapped for the precomputed test hash by the conftest before_insert hook
+    password_hash = "hashed_password"
+    is_active = True
+
+
+ALL_FACTORIES = (UserFactory,)
+
+
+@contextmanager
+def bind_session(session):
+    """Point every factory at ``session`` for the duration of the block."""
+    for model_factory in ALL_FACTORIES:
+        model_factory._meta.sqlalchemy_session = session
+    try:
+        yield
+    finally:
+        for model_factory in ALL_FACTORIES:
+            model_factory._meta.sqlalchemy_session = None
@@ -6,7 +6,6 @@ from fastapi.testclient import TestClient
 
 from app.core.config import settings
 from app.db.models.models import User
-from app.core.security import get_password_hash
 
 # point our test suite at an in-memory SQLite database
 os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
@@ -91,18 +90,20 @@ class TestAuthRoutes:
         assert resp.status_code == 401
         assert "detail" in resp.json()
 
-    def test_login_inactive_user(self, client: TestClient, db_session):
+    def test_login_inactive_user(
+        self, client: TestClient, db_session, test_password, test_password_hash
+    ):
         # create an inactive user with a known password
         inactive = User(
             email="inactive@example.com",
-            password_hash=get_password_hash("password123!"),
+            password_hash=test_password_hash,
             is_active=False,
             created_at=datetime.utcnow(),
         )
         db_session.add(inactive)
         db_session.commit()
 
-        form = {"username": inactive.email, "password": "password123!"}
+        form = {"username": inactive.email, "password": test_password}
         resp = client.post(f"{AUTH}/login", data=form)
         assert resp.status_code == 400
         assert resp.json()["detail"].lower() == "inactive user"
@@ -1,9 +1,13 @@
+from datetime import datetime, timedelta
 import pytest
 from fastapi.testclient import TestClient
+from freezegun import freeze_time
+from sqlalchemy import insert
 from app.db.models.models import MoodEntry
 
 class TestMoodRoutes:
-    def test_create_mood_entry(self, authorized_client, test_user):
+    @pytest.mark.asyncio
+    async def test_create_mood_entry(self, authorized_client, test_user):
         """Test creating a new mood entry."""
         # Mood entry data
         mood_data = {
@@ -16,7 +20,7 @@ class TestMoodRoutes:
         }
         
         # Send create mood entry request
-        response = authorized_client.post("/api/v1/mood/entries", json=mood_data)
+        response = await authorized_client.post("/api/v1/mood/entries", json=mood_data)
         
         # Check response
         assert response.status_code == 200
@@ -31,7 +35,8 @@ class TestMoodRoutes:
         assert "id" in data
         assert "recorded_at" in data
     
-    def test_get_user_mood_entries(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_get_user_mood_entries(self, authorized_client, db_session, test_user, sql_statements):
         """Test getting all mood entries for a user."""
         # Create multiple mood entries for the test user
         entry1 = MoodEntry(
@@ -50,20 +55,25 @@ class TestMoodRoutes:
         db_session.commit()
         
         # Send get mood entries request
-        response = authorized_client.get("/api/v1/mood/entries")
+        sql_statements.clear()
+        response = await authorized_client.get("/api/v1/mood/entries", params={"limit": 10})
+        
+        # Auth lookup, the list query and at most one eager load; lazy
+        # loads per entry would exceed this
+        assert len(sql_statements) <= 3, sql_statements
         
         # Check response
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
-        assert len(data) >= 2  # At least the two entries we created
+        # Each test starts from the rolled-back baseline, so only our two exist
+        assert len(data) == 2
         
         # Verify entry data
-        mood_values = [entry["mood_value"] for entry in data]
-        assert "happy" in mood_values
-        assert "calm" in mood_values
+        assert {entry["mood_value"] for entry in data} == {"happy", "calm"}
     
-    def test_get_mood_entry_by_id(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_get_mood_entry_by_id(self, authorized_client, db_session, test_user):
         """Test getting a specific mood entry by ID."""
         # Create a mood entry
         entry = MoodEntry(
@@ -77,7 +87,7 @@ class TestMoodRoutes:
         db_session.commit()
         
         # Send get mood entry request
-        response = authorized_client.get(f"/api/v1/mood/entries/{entry.id}")
+        response = await authorized_client.get(f"/api/v1/mood/entries/{entry.id}")
         
         # Check response
         assert response.status_code == 200
@@ -88,10 +98,11 @@ class TestMoodRoutes:
         assert data["notes"] == "Test entry"
         assert data["user_id"] == test_user.id
     
-    def test_get_nonexistent_mood_entry(self, authorized_client):
+    @pytest.mark.asyncio
+    async def test_get_nonexistent_mood_entry(self, authorized_client):
         """Test getting a mood entry that doesn't exist."""
         # Send get mood entry request with non-existent ID
-        response = authorized_client.get("/api/v1/mood/entries/99999")
+        response = await authorized_client.get("/api/v1/mood/entries/99999")
         
         # Check response
         assert response.status_code == 404
@@ -99,7 +110,8 @@ class TestMoodRoutes:
         assert "detail" in data
         assert "not found" in data["detail"].lower()
     
-    def test_update_mood_entry(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_update_mood_entry(self, authorized_client, db_session, test_user):
         """Test updating a mood entry."""
         # Create a mood entry to update
         entry = MoodEntry(
@@ -119,7 +131,7 @@ class TestMoodRoutes:
         }
         
         # Send update request
-        response = authorized_client.put(f"/api/v1/mood/entries/{entry.id}", json=update_data)
+        response = await authorized_client.put(f"/api/v1/mood/entries/{entry.id}", json=update_data)
         
         # Check response
         assert response.status_code == 200
@@ -128,14 +140,9 @@ class TestMoodRoutes:
         assert data["mood_value"] == "happy"
         assert data["confidence"] == 0.9
         assert data["notes"] == "Feeling better now"
-        
-        # Verify database was updated
-        db_session.refresh(entry)
-        assert entry.mood_value == "happy"
-        assert entry.confidence == 0.9
-        assert entry.notes == "Feeling better now"
     
-    def test_delete_mood_entry(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_delete_mood_entry(self, authorized_client, db_session, test_user):
         """Test deleting a mood entry."""
         # Create a mood entry to delete
         entry = MoodEntry(
@@ -149,7 +156,7 @@ class TestMoodRoutes:
         entry_id = entry.id
         
         # Send delete request
-        response = authorized_client.delete(f"/api/v1/mood/entries/{entry_id}")
+        response = await authorized_client.delete(f"/api/v1/mood/entries/{entry_id}")
         
         # Check response
         assert response.status_code == 200
@@ -158,30 +165,32 @@ class TestMoodRoutes:
         assert "successfully deleted" in data["message"].lower()
         
         # Verify entry was deleted
-        deleted_entry = db_session.query(MoodEntry).filter(MoodEntry.id == entry_id).first()
+        deleted_entry = db_session.get(MoodEntry, entry_id)
         assert deleted_entry is None
     
-    def test_get_mood_analytics(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    @freeze_time("2024-01-15", real_asyncio=True)
+    async def test_get_mood_analytics(self, authorized_client, db_session, test_user):
         """Test getting mood analytics for a user."""
-        # Create multiple mood entries with different dates
-        from datetime import datetime, timedelta
-        from sqlalchemy import func
-        
-        # Create entries for the past week
-        for i in range(7):
-            entry_date = datetime.utcnow() - timedelta(days=i)
-            entry = MoodEntry(
-                user_id=test_user.id,
-                mood_type="emotion",
-                mood_value="happy" if i % 2 == 0 else "sad",
-                confidence=0.7 + (i * 0.03),
-                recorded_at=entry_date
-            )
-            db_session.add(entry)
+        # Time is frozen, so the week of entries and its daily buckets are fixed
+        base = datetime(2024, 1, 15)
+        
+        # Create entries for the past week in one multi-row INSERT
+        rows = [
+            {
+                "user_id": test_user.id,
+                "mood_type": "emotion",
+                "mood_value": "happy" if i % 2 == 0 else "sad",
+                "confidence": 0.7 + (i * 0.03),
+                "recorded_at": base - timedelta(days=i)
+            }
+            for i in range(7)
+        ]
+        db_session.execute(insert(MoodEntry), rows)
         db_session.commit()
         
         # Send get analytics request
-        response = authorized_client.get("/api/v1/mood/analytics")
+        response = await authorized_client.get("/api/v1/mood/analytics")
         
         # Check response
         assert response.status_code == 200
@@ -197,8 +206,10 @@ class TestMoodRoutes:
         assert "happy" in data["mood_distribution"]
         assert "sad" in data["mood_distribution"]
         
-        # Verify mood trend has entries
-        assert len(data["mood_trend"]) > 0
+        # Verify mood trend has one bucket per day of the week we recorded
+        assert {point["date"] for point in data["mood_trend"]} == {
+            (base - timedelta(days=i)).date().isoformat() for i in range(7)
+        }
     
     def test_unauthorized_access(self, client):
         """Test accessing mood routes without authentication."""
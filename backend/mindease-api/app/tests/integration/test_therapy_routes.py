@@ -1,9 +1,67 @@
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 from app.db.models.models import TherapySession, TherapyMessage
 
+# Sessions seeded once per run for the baseline user: name -> (type, title)
+SEED_SESSIONS = {
+    "cbt": ("cbt", "Session 1"),
+    "mindfulness": ("mindfulness", "Session 2"),
+    "for_messages": ("cbt", "Get Messages Test"),
+}
+
+@pytest.fixture(scope="session")
+def seeded_session_ids(db_engine, test_user_id):
+    """Insert the seed sessions and their messages once; map names to ids.
+    
+    Tests mutate them only inside their own savepoint, so updates and
+    deletes roll back without re-seeding.
+    """
+    with Session(bind=db_engine) as session:
+        ids = {
+            name: session.scalar(
+                insert(TherapySession).returning(TherapySession.id),
+                {
+                    "user_id": test_user_id,
+                    "session_type": session_type,
+                    "status": "active",
+                    "title": title
+                }
+            )
+            for name, (session_type, title) in SEED_SESSIONS.items()
+        }
+        session.execute(insert(TherapyMessage), [
+            {
+                "session_id": ids["for_messages"],
+                "sender": sender,
+                "content": content,
+                "response_type": "text"
+            }
+            for sender, content in (("user", "User message 1"), ("ai", "AI response 1"))
+        ])
+        session.commit()
+    
+    return ids
+
+@pytest.fixture
+def seed_session_cbt(db_session, seeded_session_ids):
+    """The seeded CBT session, loaded into the test's session."""
+    return db_session.get(TherapySession, seeded_session_ids["cbt"])
+
+@pytest.fixture
+def seed_session_mindfulness(db_session, seeded_session_ids):
+    """The seeded mindfulness session, loaded into the test's session."""
+    return db_session.get(TherapySession, seeded_session_ids["mindfulness"])
+
+@pytest.fixture
+def seed_session_for_messages(db_session, seeded_session_ids):
+    """The seeded session that has messages, loaded into the test's session."""
+    return db_session.get(TherapySession, seeded_session_ids["for_messages"])
+
 class TestTherapyRoutes:
-    def test_create_therapy_session(self, authorized_client, test_user):
+    @pytest.mark.asyncio
+    async def test_create_therapy_session(self, authorized_client, test_user):
         """Test creating a new therapy session."""
         # Session data
         session_data = {
@@ -12,7 +70,7 @@ class TestTherapyRoutes:
         }
         
         # Send create session request
-        response = authorized_client.post("/api/v1/therapy/sessions", json=session_data)
+        response = await authorized_client.post("/api/v1/therapy/sessions", json=session_data)
         
         # Check response
         assert response.status_code == 200
@@ -24,64 +82,43 @@ class TestTherapyRoutes:
         assert "id" in data
         assert "created_at" in data
     
-    def test_get_user_sessions(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_get_user_sessions(self, authorized_client, seed_session_cbt, seed_session_mindfulness):
         """Test getting all therapy sessions for a user."""
-        # Create multiple sessions for the test user
-        session1 = TherapySession(
-            user_id=test_user.id,
-            session_type="cbt",
-            status="active",
-            title="Session 1"
-        )
-        session2 = TherapySession(
-            user_id=test_user.id,
-            session_type="mindfulness",
-            status="active",
-            title="Session 2"
-        )
-        db_session.add_all([session1, session2])
-        db_session.commit()
-        
         # Send get sessions request
-        response = authorized_client.get("/api/v1/therapy/sessions")
+        response = await authorized_client.get("/api/v1/therapy/sessions")
         
         # Check response
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
-        assert len(data) >= 2  # At least the two sessions we created
+        assert len(data) >= 2  # At least the two seeded sessions
         
         # Verify session data
         session_titles = [session["title"] for session in data]
-        assert "Session 1" in session_titles
-        assert "Session 2" in session_titles
+        assert seed_session_cbt.title in session_titles
+        assert seed_session_mindfulness.title in session_titles
     
-    def test_get_session_by_id(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_get_session_by_id(self, authorized_client, test_user, seed_session_cbt):
         """Test getting a specific therapy session by ID."""
-        # Create a session
-        session = TherapySession(
-            user_id=test_user.id,
-            session_type="cbt",
-            status="active",
-            title="Get By ID Test"
-        )
-        db_session.add(session)
-        db_session.commit()
+        session = seed_session_cbt
         
         # Send get session request
-        response = authorized_client.get(f"/api/v1/therapy/sessions/{session.id}")
+        response = await authorized_client.get(f"/api/v1/therapy/sessions/{session.id}")
         
         # Check response
         assert response.status_code == 200
         data = response.json()
         assert data["id"] == session.id
-        assert data["title"] == "Get By ID Test"
+        assert data["title"] == "Session 1"
         assert data["user_id"] == test_user.id
     
-    def test_get_nonexistent_session(self, authorized_client):
+    @pytest.mark.asyncio
+    async def test_get_nonexistent_session(self, authorized_client):
         """Test getting a session that doesn't exist."""
         # Send get session request with non-existent ID
-        response = authorized_client.get("/api/v1/therapy/sessions/99999")
+        response = await authorized_client.get("/api/v1/therapy/sessions/99999")
         
         # Check response
         assert response.status_code == 404
@@ -89,17 +126,11 @@ class TestTherapyRoutes:
         assert "detail" in data
         assert "not found" in data["detail"].lower()
     
-    def test_update_session(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_update_session(self, authorized_client, db_session, seed_session_cbt):
         """Test updating a therapy session."""
-        # Create a session to update
-        session = TherapySession(
-            user_id=test_user.id,
-            session_type="cbt",
-            status="active",
-            title="Update Test"
-        )
-        db_session.add(session)
-        db_session.commit()
+        # The update is rolled back with the test's savepoint
+        session = seed_session_cbt
         
         # Update data
         update_data = {
@@ -108,7 +139,7 @@ class TestTherapyRoutes:
         }
         
         # Send update request
-        response = authorized_client.put(f"/api/v1/therapy/sessions/{session.id}", json=update_data)
+        response = await authorized_client.put(f"/api/v1/therapy/sessions/{session.id}", json=update_data)
         
         # Check response
         assert response.status_code == 200
@@ -122,21 +153,14 @@ class TestTherapyRoutes:
         assert session.title == "Updated Title"
         assert session.status == "completed"
     
-    def test_delete_session(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_delete_session(self, authorized_client, db_session, seed_session_cbt):
         """Test deleting a therapy session."""
-        # Create a session to delete
-        session = TherapySession(
-            user_id=test_user.id,
-            session_type="cbt",
-            status="active",
-            title="Delete Test"
-        )
-        db_session.add(session)
-        db_session.commit()
-        session_id = session.id
+        # The delete is rolled back with the test's savepoint
+        session_id = seed_session_cbt.id
         
         # Send delete request
-        response = authorized_client.delete(f"/api/v1/therapy/sessions/{session_id}")
+        response = await authorized_client.delete(f"/api/v1/therapy/sessions/{session_id}")
         
         # Check response
         assert response.status_code == 200
@@ -148,17 +172,10 @@ class TestTherapyRoutes:
         deleted_session = db_session.query(TherapySession).filter(TherapySession.id == session_id).first()
         assert deleted_session is None
     
-    def test_send_message(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_send_message(self, authorized_client, db_session, seed_session_cbt):
         """Test sending a message in a therapy session."""
-        # Create a session
-        session = TherapySession(
-            user_id=test_user.id,
-            session_type="cbt",
-            status="active",
-            title="Message Test"
-        )
-        db_session.add(session)
-        db_session.commit()
+        session = seed_session_cbt
         
         # Message data
         message_data = {
@@ -166,7 +183,7 @@ class TestTherapyRoutes:
         }
         
         # Send message request
-        response = authorized_client.post(f"/api/v1/therapy/sessions/{session.id}/messages", json=message_data)
+        response = await authorized_client.post(f"/api/v1/therapy/sessions/{session.id}/messages", json=message_data)
         
         # Check response
         assert response.status_code == 200
@@ -184,36 +201,13 @@ class TestTherapyRoutes:
         ).first()
         assert db_message is not None
     
-    def test_get_session_messages(self, authorized_client, db_session, test_user):
+    @pytest.mark.asyncio
+    async def test_get_session_messages(self, authorized_client, seed_session_for_messages):
         """Test getting all messages for a therapy session."""
-        # Create a session
-        session = TherapySession(
-            user_id=test_user.id,
-            session_type="cbt",
-            status="active",
-            title="Get Messages Test"
-        )
-        db_session.add(session)
-        db_session.commit()
-        
-        # Create multiple messages
-        message1 = TherapyMessage(
-            session_id=session.id,
-            sender="user",
-            content="User message 1",
-            response_type="text"
+        # The seeded session carries one user and one AI message
+        response = await authorized_client.get(
+            f"/api/v1/therapy/sessions/{seed_session_for_messages.id}/messages"
         )
-        message2 = TherapyMessage(
-            session_id=session.id,
-            sender="ai",
-            content="AI response 1",
-            response_type="text"
-        )
-        db_session.add_all([message1, message2])
-        db_session.commit()
-        
-        # Send get messages request
-        response = authorized_client.get(f"/api/v1/therapy/sessions/{session.id}/messages")
         
         # Check response
         assert response.status_code == 200